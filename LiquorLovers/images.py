@@ -0,0 +1,152 @@
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files import File
+from django.db import close_old_connections, models, transaction
+from django.utils.translation import gettext_lazy as _
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+VARIANT_SIZES = (64, 256, 1024)
+VARIANT_FORMATS = (('webp', 'WEBP'), ('jpg', 'JPEG'))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class ImageStatus(models.TextChoices):
+    PROCESSING = 'processing', _('Processing')
+    READY = 'ready', _('Ready')
+    FAILED = 'failed', _('Failed')
+
+
+def square(size):
+    """
+    Returns a processor that crops the center square of the image and downscales it to at most `size` pixels.
+    """
+    def processor(image):
+        side = min(*image.size, size)
+        return ImageOps.fit(image, (side, side), Image.Resampling.LANCZOS)
+
+    return processor
+
+
+def fit_within(size):
+    """
+    Returns a processor that downscales the image to fit within `size`, keeping its aspect ratio.
+    """
+    def processor(image):
+        image.thumbnail(size, Image.Resampling.LANCZOS)
+        return image
+
+    return processor
+
+
+def variant_name(name, size, extension):
+    root, _extension = os.path.splitext(name)
+    return f'{root}_{size}.{extension}'
+
+
+def variant_names(name):
+    return [variant_name(name, size, extension) for size in VARIANT_SIZES for extension, _format in VARIANT_FORMATS]
+
+
+def render_variants(storage, name, image):
+    """
+    Stores a downscaled copy of the image next to `name` for every size in `VARIANT_SIZES`
+    and every format in `VARIANT_FORMATS`. Images are never upscaled.
+    """
+    for size in VARIANT_SIZES:
+        variant = image.copy()
+        variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+        for extension, image_format in VARIANT_FORMATS:
+            mode = 'RGB' if image_format == 'JPEG' or 'A' not in variant.getbands() else 'RGBA'
+            with storage.open(variant_name(name, size, extension), 'wb') as file:
+                variant.convert(mode).save(file, format=image_format, quality=80)
+
+
+def render_stored_variants(storage, name):
+    with storage.open(name, 'rb') as file:
+        image = Image.open(file)
+        image.load()
+
+    render_variants(storage, name, ImageOps.exif_transpose(image))
+
+
+def delete_variants(storage, name):
+    for variant in variant_names(name):
+        storage.delete(variant)
+
+
+def get_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.IMAGE_PROCESSING_WORKERS,
+                                           thread_name_prefix='image-processing')
+        return _executor
+
+
+def process_image_later(instance, field_name, status_field_name, processor):
+    """
+    Processes the image stored in `field_name` of the instance once the current transaction commits.
+    The work runs in a thread pool of `IMAGE_PROCESSING_WORKERS` threads, or inline when it is set to 0,
+    and `status_field_name` is set to ready or failed once the image and its variants are stored.
+    """
+    job = (type(instance), instance.pk, field_name, status_field_name, getattr(instance, field_name).name, processor)
+
+    def submit():
+        if settings.IMAGE_PROCESSING_WORKERS:
+            get_executor().submit(process_image, *job)
+        else:
+            process_image(*job)
+
+    transaction.on_commit(submit)
+
+
+def process_image(model, pk, field_name, status_field_name, name, processor):
+    """
+    Processes the image and stores the result as a new file. The instance is only updated if it still points
+    at the original file, so a job for an image that was replaced in the meantime does not overwrite the new one.
+    The new file is stored, the instance updated and the file it does not use in the end released
+    in one transaction.
+    """
+    close_old_connections()
+
+    storage = model._meta.get_field(field_name).storage
+
+    try:
+        with storage.open(name, 'rb') as file:
+            image = Image.open(file)
+            image_format = image.format
+            image.load()
+
+        image = processor(ImageOps.exif_transpose(image))
+        if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+
+        content = io.BytesIO()
+        image.save(content, format=image_format)
+
+        with transaction.atomic():
+            processed_name = storage.save(name, File(content, name=name))
+
+            if not all(storage.exists(variant) for variant in variant_names(processed_name)):
+                render_variants(storage, processed_name, image)
+
+            updated = model._default_manager.filter(pk=pk, **{field_name: name}) \
+                .update(**{field_name: processed_name, status_field_name: ImageStatus.READY})
+
+            storage.release(name if updated else processed_name)
+    except Exception:
+        logger.exception('Processing of %s failed', name)
+        model._default_manager.filter(pk=pk, **{field_name: name}).update(**{status_field_name: ImageStatus.FAILED})
+
+    close_old_connections()
@@ -0,0 +1,127 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+IMMUTABLE_NAME = re.compile(
+    r'^([0-9a-f]{64}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})(_\d+)?\.\w+$'
+)
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    """
+    File-like object that reads `length` bytes of the file starting at `start`. It keeps `fileno`,
+    so servers with `wsgi.file_wrapper` support (gunicorn) still send the range with `sendfile`.
+    """
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        self.file.seek(start)
+
+    def read(self, size=-1):
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def get_etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def parse_range(header, size):
+    """
+    Returns the `(start, end)` of a single byte range, both inclusive, `None` for a header this view ignores
+    (e.g. several ranges) and `False` for a range that can not be satisfied.
+    """
+    match = RANGE.match(header.replace(' ', ''))
+    if match is None or match.groups() == ('', ''):
+        return None
+
+    start, end = match.groups()
+    if start == '':
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end), size - 1) if end else size - 1
+
+    if start > end or start >= size:
+        return False
+
+    return start, end
+
+
+@require_safe
+def serve(request, path):
+    """
+    Serves a file from `MEDIA_ROOT`. With `MEDIA_SENDFILE_HEADER` set the file is handed to the front server
+    through `X-Accel-Redirect` or `X-Sendfile`, otherwise it is streamed with `wsgi.file_wrapper`.
+    Files named with a content hash or a UUID never change, so they are cached for `MEDIA_CACHE_MAX_AGE`, the others
+    (e.g. defaults) for `MEDIA_DEFAULT_CACHE_MAX_AGE`.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        stat = os.stat(full_path)
+    except (OSError, ValueError, SuspiciousFileOperation):
+        raise Http404
+
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    etag = get_etag(stat)
+
+    if etag in (tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')):
+        response = HttpResponseNotModified()
+    elif settings.MEDIA_SENDFILE_HEADER:
+        response = HttpResponse()
+        if settings.MEDIA_SENDFILE_HEADER.lower() == 'x-accel-redirect':
+            relative_path = os.path.relpath(full_path, settings.MEDIA_ROOT).replace(os.sep, '/')
+            response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(relative_path)
+        else:
+            response[settings.MEDIA_SENDFILE_HEADER] = full_path
+    else:
+        byte_range = None
+        if 'Range' in request.headers and request.headers.get('If-Range', etag) == etag:
+            byte_range = parse_range(request.headers['Range'], stat.st_size)
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+        elif byte_range is not None:
+            start, end = byte_range
+            response = FileResponse(FileRange(open(full_path, 'rb'), start, end - start + 1), status=206)
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            response['Content-Length'] = end - start + 1
+        else:
+            response = FileResponse(open(full_path, 'rb'))
+            response['Content-Length'] = stat.st_size
+
+        response['Accept-Ranges'] = 'bytes'
+
+    if response.status_code in (200, 206):
+        content_type, _encoding = mimetypes.guess_type(full_path)
+        response['Content-Type'] = content_type or 'application/octet-stream'
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+
+    if IMMUTABLE_NAME.match(os.path.basename(path)):
+        patch_cache_control(response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=settings.MEDIA_DEFAULT_CACHE_MAX_AGE)
+
+    return response
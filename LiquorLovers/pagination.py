@@ -0,0 +1,38 @@
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over a stable ordering, so deep pages neither scan the skipped rows nor count the whole table.
+    Requests that still send `limit`, `offset` or a custom `ordering` are served by `LimitOffsetPagination`,
+    so existing clients keep working. Subclass and set `ordering` to key the cursor on another field.
+    """
+    ordering = 'id'
+    offset_query_params = ('limit', 'offset', 'ordering')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.offset_paginator = None
+
+        if self.cursor_query_param not in request.query_params and \
+                any(param in request.query_params for param in self.offset_query_params):
+            self.offset_paginator = LimitOffsetPagination()
+            page = self.offset_paginator.paginate_queryset(queryset, request, view)
+            self.display_page_controls = self.offset_paginator.display_page_controls
+            return page
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        return (self.ordering,) if isinstance(self.ordering, str) else tuple(self.ordering)
+
+    def get_paginated_response(self, data):
+        if self.offset_paginator is not None:
+            return self.offset_paginator.get_paginated_response(data)
+
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.offset_paginator is not None:
+            return self.offset_paginator.to_html()
+
+        return super().to_html()
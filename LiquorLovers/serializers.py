@@ -0,0 +1,53 @@
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from .images import VARIANT_FORMATS, VARIANT_SIZES, ImageStatus, variant_name
+
+
+class UniqueCreateMixin:
+    """
+    Creates the instance with a single insert and lets the database constraints catch duplicates.
+    An `IntegrityError` is turned into a validation error with the message returned by `get_integrity_error_message`.
+    """
+    unique_error_message = _('Invitation like this already exists. ')
+
+    def get_integrity_error_message(self, validated_data):
+        return self.unique_error_message
+
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            message = self.get_integrity_error_message(validated_data)
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]})
+
+
+class ImageVariantsField(serializers.Field):
+    """
+    Read-only `{size: {extension: url}}` map of the variants rendered for an image field.
+    It is null while the image is still being processed.
+    """
+    def __init__(self, image_field, status_field, **kwargs):
+        self.image_field = image_field
+        self.status_field = status_field
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        image = getattr(instance, self.image_field)
+        if not image or getattr(instance, self.status_field) != ImageStatus.READY:
+            return None
+
+        request = self.context.get('request')
+
+        def url(name):
+            url = image.storage.url(name)
+            return request.build_absolute_uri(url) if request is not None else url
+
+        return {str(size): {extension: url(variant_name(image.name, size, extension))
+                            for extension, _format in VARIANT_FORMATS}
+                for size in VARIANT_SIZES}
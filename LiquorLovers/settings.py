@@ -133,6 +133,23 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+LOCAL_CACHE_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND') or LOCAL_CACHE_BACKEND,
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# A local cache is only invalidated in the process that changed the friendship, so the other processes
+# can only be trusted with friend ids for a short time. Configure a shared cache (e.g. redis) in production.
+
+FRIEND_IDS_CACHE_TIMEOUT = 60 if CACHES['default']['BACKEND'] == LOCAL_CACHE_BACKEND else 60 * 60 * 24
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -179,6 +196,19 @@ STATIC_URL = 'static/'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+DEFAULT_FILE_STORAGE = 'LiquorLovers.storage.ContentAddressedStorage'
+
+# Media files are handed to the front server when MEDIA_SENDFILE_HEADER is X-Accel-Redirect (nginx,
+# served from the internal MEDIA_ACCEL_REDIRECT_PREFIX location) or X-Sendfile (apache, lighttpd)
+
+MEDIA_SENDFILE_HEADER = os.getenv('MEDIA_SENDFILE_HEADER', '')
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv('MEDIA_ACCEL_REDIRECT_PREFIX') or '/protected-media/'
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+MEDIA_DEFAULT_CACHE_MAX_AGE = 60 * 60 * 24
+
+# Uploaded images are processed by this many background threads after the upload commits, 0 processes them inline
+
+IMAGE_PROCESSING_WORKERS = int(os.getenv('IMAGE_PROCESSING_WORKERS') or 2)
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
@@ -0,0 +1,167 @@
+import hashlib
+import os
+import re
+from uuid import uuid4
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+from django.db.models.fields.files import FieldFile
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+
+from .images import delete_variants
+
+SHARDED_NAME = re.compile(r'(^|/)[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.[^/]+$')
+
+TRACKED_FIELDS = []
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names every file after the SHA-256 of its content, keeping the directory and the
+    extension of the requested name. Files are spread over two levels of prefix directories
+    (`pfps/ab/cd/abcd....jpg`), so no directory grows too large, and identical uploads share one file.
+    Every save takes a reference to the file in `StoredFile` and the models that use it give it back through
+    `release`, so a file is deleted once its last reference is released. The `StoredFile` row is locked while
+    the file is written or deleted, so a save never reuses a file that is being deleted.
+    """
+    def _save(self, name, content):
+        content_hash = hashlib.sha256()
+        for chunk in content.chunks():
+            content_hash.update(chunk)
+        content.seek(0)
+
+        name = self.content_name(name, content_hash.hexdigest())
+
+        with transaction.atomic():
+            self.add_references(name, 1)
+
+            if not self.exists(name):
+                temporary_name = super()._save(f'{name}.{uuid4().hex}.tmp', content)
+                os.replace(self.path(temporary_name), self.path(name))
+
+        return name
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is derived from the content in `_save`, so an existing file with this name is no conflict
+        return name
+
+    @staticmethod
+    def is_sharded(name):
+        return SHARDED_NAME.search(name) is not None
+
+    def content_name(self, name, content_hash):
+        """
+        Returns the sharded name for content with the given hash, in the upload directory of `name`.
+        """
+        directory, filename = os.path.split(name)
+        _root, extension = os.path.splitext(filename)
+
+        if self.is_sharded(name):
+            directory = os.path.dirname(os.path.dirname(directory))
+
+        return os.path.join(directory, content_hash[:2], content_hash[2:4], f'{content_hash}{extension.lower()}')
+
+    @staticmethod
+    def locked(name):
+        """
+        Returns the `StoredFile` rows of the name, locked until the end of the current transaction.
+        """
+        StoredFile = apps.get_model('user', 'StoredFile')
+        return StoredFile.objects.select_for_update().filter(name=name)
+
+    def add_references(self, name, count):
+        """
+        Adds references to the file, creating its `StoredFile` row if needed. Must be called in a transaction.
+        """
+        stored_file, _created = self.locked(name).get_or_create(name=name)
+        stored_file.reference_count = F('reference_count') + count
+        stored_file.save(update_fields=['reference_count'])
+
+    def move_references(self, old_name, new_name):
+        """
+        Moves the references of a renamed file, e.g. by `shard_media`. Must be called in a transaction.
+        """
+        stored_file = self.locked(old_name).first()
+        if stored_file is not None:
+            self.add_references(new_name, stored_file.reference_count)
+            stored_file.delete()
+
+    def release(self, name):
+        """
+        Gives back a reference to the file in the current transaction. Once the last one is released, the file
+        and its image variants are deleted after the transaction commits, unless a save took a new reference
+        in the meantime. Defaults and files without a `StoredFile` row are never deleted.
+        """
+        if not name or name in {model._meta.get_field(field_name).default for model, field_name in TRACKED_FIELDS}:
+            return
+
+        def delete_if_unreferenced():
+            with transaction.atomic():
+                stored_file = self.locked(name).first()
+                if stored_file is not None and stored_file.reference_count == 0:
+                    delete_variants(self, name)
+                    self.delete(name)
+                    stored_file.delete()
+
+        with transaction.atomic():
+            stored_file = self.locked(name).first()
+            if stored_file is None:
+                return
+
+            stored_file.reference_count = max(stored_file.reference_count - 1, 0)
+            stored_file.save(update_fields=['reference_count'])
+
+            if stored_file.reference_count == 0:
+                transaction.on_commit(delete_if_unreferenced)
+
+
+def stored_name(file):
+    """
+    Returns the name of an already stored file, for a value loaded from the database or a saved `FieldFile`.
+    """
+    if isinstance(file, str):
+        return file
+
+    if isinstance(file, FieldFile) and file._committed:
+        return file.name
+
+    return None
+
+
+def track_files(model, *field_names):
+    """
+    Releases the files of the given fields of the model when they are replaced or their instance is deleted.
+    A file uploaded again with the content of the one already stored takes a second reference to the same name,
+    so that reference is released as well.
+    """
+    for field_name in field_names:
+        TRACKED_FIELDS.append((model, field_name))
+
+    def remember_files(instance, **kwargs):
+        instance._stored_files = {field_name: stored_name(instance.__dict__.get(field_name))
+                                  for field_name in field_names}
+
+    def remember_uploads(instance, **kwargs):
+        instance._uploaded_files = {field_name for field_name in field_names
+                                    if not getattr(instance, field_name)._committed}
+
+    def release_replaced_files(instance, **kwargs):
+        for field_name in field_names:
+            file = getattr(instance, field_name)
+            previous_name = instance._stored_files.get(field_name)
+            if previous_name and (previous_name != file.name or field_name in instance._uploaded_files):
+                file.storage.release(previous_name)
+
+        remember_files(instance)
+
+    def release_deleted_files(instance, **kwargs):
+        for field_name in field_names:
+            file = getattr(instance, field_name)
+            file.storage.release(file.name)
+
+    post_init.connect(remember_files, sender=model, weak=False)
+    pre_save.connect(remember_uploads, sender=model, weak=False)
+    post_save.connect(release_replaced_files, sender=model, weak=False)
+    post_delete.connect(release_deleted_files, sender=model, weak=False)
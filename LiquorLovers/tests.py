@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+
+
+@override_settings(MEDIA_SENDFILE_HEADER='')
+class MediaTests(SimpleTestCase):
+    NAME = 'pfps/0f8fad5b-d9cb-469f-a165-70867728950e.jpg'
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.media_settings = override_settings(MEDIA_ROOT=self.media_root)
+        self.media_settings.enable()
+
+        os.makedirs(os.path.join(self.media_root, 'pfps'))
+        with open(os.path.join(self.media_root, self.NAME), 'wb') as file:
+            file.write(bytes(range(100)))
+
+    def tearDown(self):
+        self.media_settings.disable()
+        shutil.rmtree(self.media_root)
+
+    def test_serve_media(self):
+        response = self.client.get(f'/media/{self.NAME}')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(100)))
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertIn('immutable', response['Cache-Control'])
+
+        response = self.client.get(f'/media/{self.NAME}', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get('/media/../manage.py')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_serve_media_range(self):
+        response = self.client.get(f'/media/{self.NAME}', HTTP_RANGE='bytes=10-19')
+
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(10, 20)))
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/100')
+
+        response = self.client.get(f'/media/{self.NAME}', HTTP_RANGE='bytes=200-')
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+
+    @override_settings(MEDIA_SENDFILE_HEADER='X-Accel-Redirect', MEDIA_ACCEL_REDIRECT_PREFIX='/protected-media/')
+    def test_serve_media_accel_redirect(self):
+        response = self.client.get(f'/media/{self.NAME}')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.NAME}')
+        self.assertEqual(response.content, b'')
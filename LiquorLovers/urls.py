@@ -13,15 +13,16 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+import re
+
 from django.contrib import admin
 from django.urls import path, include, re_path
-from django.conf.urls.static import static
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
-from LiquorLovers import settings
+from LiquorLovers import media, settings
 
 urlpatterns = [
     path('auth/token/', TokenObtainPairView.as_view()),
@@ -29,10 +30,9 @@ urlpatterns = [
     path('users/', include('user.urls')),
     path('friends/', include('friend.urls')),
     path('parties/', include('party.urls')),
+    re_path(rf'^{re.escape(settings.MEDIA_URL.lstrip("/"))}(?P<path>.*)$', media.serve),
 ]
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-
 if settings.DEBUG:
     schema_view = get_schema_view(
         openapi.Info(
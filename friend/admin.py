@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import FriendsList, FriendInvitation
+from .models import FriendsList, Friendship, FriendInvitation
 
 admin.site.register(FriendsList)
+admin.site.register(Friendship)
 admin.site.register(FriendInvitation)
@@ -0,0 +1,223 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+from django.apps import apps
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+REBUILD_INTERVAL = 60 * 5
+MAX_PENDING_CHANGES = 10000
+
+
+class FriendGraph:
+    """
+    In-memory friendship graph stored as CSR arrays: the friends of user `u` are
+    `indices[indptr[u]:indptr[u + 1]]`. The arrays are built from the `Friendship` table and changes made
+    by this process are kept in a small overlay until the next rebuild. Changes made by other processes
+    show up after at most `REBUILD_INTERVAL` seconds. Only the first build blocks, later rebuilds run in
+    a background thread, one at a time, while the current arrays keep serving.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.build_lock = threading.Lock()
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.added = defaultdict(set)
+        self.removed = defaultdict(set)
+        self.pending_changes = 0
+        self.built_at = None
+        self.replayed_changes = None
+
+    def build(self):
+        with self.build_lock:
+            self._build()
+
+    def _build(self):
+        """
+        Rebuilds the arrays from the `Friendship` table, the caller holds `build_lock`. Changes applied while
+        the table is read may be missing from the snapshot, so they are replayed on top of the new arrays.
+        """
+        Friendship = apps.get_model('friend', 'Friendship')
+
+        with self.lock:
+            self.replayed_changes = []
+
+        try:
+            edges = np.array(Friendship.objects.values_list('user1_id', 'user2_id'), dtype=np.int64).reshape(-1, 2)
+        except Exception:
+            with self.lock:
+                self.replayed_changes = None
+            raise
+
+        sources = np.concatenate([edges[:, 0], edges[:, 1]])
+        targets = np.concatenate([edges[:, 1], edges[:, 0]])
+
+        order = np.lexsort((targets, sources))
+        size = int(sources.max()) + 1 if len(sources) else 0
+
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=size), out=indptr[1:])
+        index_type = np.int32 if size <= np.iinfo(np.int32).max else np.int64
+
+        with self.lock:
+            self.indptr = indptr
+            self.indices = targets[order].astype(index_type)
+            self.added = defaultdict(set)
+            self.removed = defaultdict(set)
+            self.pending_changes = 0
+            self.built_at = time.monotonic()
+
+            replayed_changes, self.replayed_changes = self.replayed_changes, None
+            for change, user_id, friend_id in replayed_changes:
+                change(user_id, friend_id)
+
+    def build_in_background(self):
+        try:
+            self._build()
+        except Exception:
+            logger.exception('Rebuilding the friend graph failed')
+        finally:
+            self.build_lock.release()
+            connection.close()
+
+    def is_stale(self):
+        return time.monotonic() - self.built_at > REBUILD_INTERVAL or self.pending_changes > MAX_PENDING_CHANGES
+
+    def ensure_fresh(self):
+        if self.built_at is None:
+            with self.build_lock:
+                if self.built_at is None:
+                    self._build()
+        elif self.is_stale() and self.build_lock.acquire(blocking=False):
+            threading.Thread(target=self.build_in_background, name='friend-graph-build', daemon=True).start()
+
+    def add_edge(self, user_id, friend_id):
+        with self.lock:
+            self._add_edge(user_id, friend_id)
+
+    def remove_edge(self, user_id, friend_id):
+        with self.lock:
+            self._remove_edge(user_id, friend_id)
+
+    def _add_edge(self, user_id, friend_id):
+        for source, target in ((user_id, friend_id), (friend_id, user_id)):
+            self.removed[source].discard(target)
+            self.added[source].add(target)
+        self.pending_changes += 1
+
+        if self.replayed_changes is not None:
+            self.replayed_changes.append((self._add_edge, user_id, friend_id))
+
+    def _remove_edge(self, user_id, friend_id):
+        for source, target in ((user_id, friend_id), (friend_id, user_id)):
+            self.added[source].discard(target)
+            self.removed[source].add(target)
+        self.pending_changes += 1
+
+        if self.replayed_changes is not None:
+            self.replayed_changes.append((self._remove_edge, user_id, friend_id))
+
+    def neighbors(self, user_id):
+        if user_id + 1 < len(self.indptr):
+            neighbors = self.indices[self.indptr[user_id]:self.indptr[user_id + 1]]
+        else:
+            neighbors = self.indices[:0]
+
+        removed = self.removed.get(user_id)
+        if removed:
+            neighbors = neighbors[~np.isin(neighbors, list(removed))]
+
+        added = self.added.get(user_id)
+        if added:
+            neighbors = np.union1d(neighbors, list(added))
+
+        return neighbors
+
+    def suggestions(self, user_id, limit, exclude=()):
+        """
+        Returns up to `limit` (user id, shared friends count) pairs for the friends of friends of the given user,
+        ranked by the number of friends they share with the user. Users in `exclude` are skipped.
+        """
+        self.ensure_fresh()
+
+        with self.lock:
+            friends = self.neighbors(user_id)
+            if not len(friends):
+                return []
+
+            candidates = np.concatenate([self.neighbors(friend_id) for friend_id in friends.tolist()])
+
+        excluded = np.union1d(friends, [user_id, *exclude])
+        candidates = candidates[~np.isin(candidates, excluded)]
+
+        candidate_ids, shared_counts = np.unique(candidates, return_counts=True)
+        ranking = np.lexsort((candidate_ids, -shared_counts))[:limit]
+        return list(zip(candidate_ids[ranking].tolist(), shared_counts[ranking].tolist()))
+
+    def shortest_path(self, source_id, target_id, max_depth):
+        """
+        Returns the shortest list of user ids connecting the two given users through friendships, or None when
+        they are more than `max_depth` friendships apart. The search is a bidirectional breadth-first search that
+        expands the smaller frontier a whole level at a time, so it only visits about half the depth on each side.
+        """
+        if source_id == target_id:
+            return [source_id]
+
+        self.ensure_fresh()
+
+        with self.lock:
+            parents = ({source_id: None}, {target_id: None})
+            depths = ({source_id: 0}, {target_id: 0})
+            frontiers = ([source_id], [target_id])
+
+            for depth in range(max_depth):
+                side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+                other = 1 - side
+                next_frontier = []
+                meetings = []
+
+                for node in frontiers[side]:
+                    for neighbor in self.neighbors(node).tolist():
+                        if neighbor in parents[side]:
+                            continue
+
+                        parents[side][neighbor] = node
+                        depths[side][neighbor] = depths[side][node] + 1
+                        next_frontier.append(neighbor)
+
+                        if neighbor in parents[other]:
+                            meetings.append(neighbor)
+
+                if meetings:
+                    meeting = min(meetings, key=lambda node: depths[other][node])
+                    return self._join_path(parents, meeting)
+
+                if not next_frontier:
+                    return None
+
+                frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+
+        return None
+
+    @staticmethod
+    def _join_path(parents, meeting):
+        path = []
+        node = meeting
+        while node is not None:
+            path.append(node)
+            node = parents[0][node]
+        path.reverse()
+
+        node = parents[1][meeting]
+        while node is not None:
+            path.append(node)
+            node = parents[1][node]
+
+        return path
+
+
+friend_graph = FriendGraph()
@@ -0,0 +1,193 @@
+from array import array
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, When
+from django.db.models.functions import Coalesce
+from django.utils.translation import gettext_lazy as _
+
+FRIEND_IDS_CACHE_KEY = 'friend:ids:{}'
+
+
+class FriendshipManager(models.Manager):
+    """
+    Custom friendship manager. Every friendship is a single row with the lower user id in `user1`,
+    so all the methods below normalize the pair before touching the table.
+    """
+    @staticmethod
+    def normalize(user, friend):
+        user_id, friend_id = getattr(user, 'pk', user), getattr(friend, 'pk', friend)
+        return min(user_id, friend_id), max(user_id, friend_id)
+
+    def between(self, user, friend):
+        user1_id, user2_id = self.normalize(user, friend)
+        return self.filter(user1_id=user1_id, user2_id=user2_id)
+
+    def involving(self, user):
+        return self.filter(Q(user1=user) | Q(user2=user))
+
+    def add(self, user, friend):
+        user1_id, user2_id = self.normalize(user, friend)
+        self.bulk_create([self.model(user1_id=user1_id, user2_id=user2_id)], ignore_conflicts=True)
+
+    def remove(self, user, friend):
+        self.between(user, friend).delete()
+
+    def friends_of(self, user):
+        """
+        Returns a queryset of the users who are friends with the given user.
+        """
+        User = self.model._meta.get_field('user1').related_model
+        return User.objects.filter(
+            Q(pk__in=self.filter(user1=user).values('user2')) |
+            Q(pk__in=self.filter(user2=user).values('user1'))
+        )
+
+    def mutual_friends(self, user, other):
+        """
+        Returns a queryset of the users who are friends with both given users.
+        """
+        return self.friends_of(user).filter(pk__in=self.friends_of(other).values('pk'))
+
+    def annotate_mutual_friends_count(self, users, user):
+        """
+        Annotates a queryset of users with `mutual_friends_count`, the number of friends each of them shares
+        with the given user. The count is a correlated subquery, so a whole page is counted in the same query.
+        """
+        user_friends = self.friends_of(user).values('pk')
+        as_user1 = self.filter(user1=OuterRef('pk'), user2__in=user_friends) \
+            .values('user1').annotate(count=Count('pk')).values('count')
+        as_user2 = self.filter(user2=OuterRef('pk'), user1__in=user_friends) \
+            .values('user2').annotate(count=Count('pk')).values('count')
+
+        return users.annotate(
+            mutual_friends_count=Coalesce(Subquery(as_user1), 0) + Coalesce(Subquery(as_user2), 0)
+        )
+
+    def friend_ids(self, user):
+        """
+        Returns the set of ids of the given user's friends, fetched with a single query over the friendship table.
+        """
+        friend_id = Case(When(user1=user, then=F('user2')), default=F('user1'))
+        return set(self.involving(user).annotate(friend_id=friend_id).values_list('friend_id', flat=True))
+
+    def cached_friend_ids(self, user_id):
+        """
+        Returns the ids of the user's friends as a frozenset, served from the cache when possible.
+        The ids are cached as a packed array of 64-bit integers, so a cached list costs 8 bytes per friend.
+        """
+        key = FRIEND_IDS_CACHE_KEY.format(user_id)
+
+        packed_ids = cache.get(key)
+        if packed_ids is None:
+            packed_ids = array('q', sorted(self.friend_ids(user_id))).tobytes()
+            cache.set(key, packed_ids, settings.FRIEND_IDS_CACHE_TIMEOUT)
+
+        friend_ids = array('q')
+        friend_ids.frombytes(packed_ids)
+        return frozenset(friend_ids)
+
+    def invalidate_friend_ids(self, *user_ids):
+        """
+        Drops the cached friend ids of the given users. The keys are dropped right away and once more after
+        the surrounding transaction commits, so a concurrent read can not cache the state from before the change.
+        """
+        keys = [FRIEND_IDS_CACHE_KEY.format(user_id) for user_id in user_ids]
+
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class FriendInvitationManager(models.Manager):
+    """
+    Custom friend invitation manager.
+    """
+    CREATED = 'created'
+    NOT_FOUND = 'not_found'
+    SELF = 'self'
+    ALREADY_FRIENDS = 'already_friends'
+    ALREADY_INVITED = 'already_invited'
+    INVITED_YOU = 'invited_you'
+
+    MESSAGES = {
+        NOT_FOUND: _('User with this public id does not exist. '),
+        SELF: _('You can not invite yourself. '),
+        ALREADY_FRIENDS: _('This user is already your friend. '),
+        ALREADY_INVITED: _('Invitation like this already exists. '),
+        INVITED_YOU: _('The receiver already invited you. '),
+    }
+
+    def bulk_invite(self, sender, receiver_public_ids):
+        """
+        Invites every user in `receiver_public_ids` and returns a `{public_id: (status, invitation)}` dict.
+        Existing invitations in both directions are looked up with a single query and the new ones
+        are inserted with a single `bulk_create`, so the number of queries does not grow with the receivers.
+        Invitations created concurrently are skipped by the insert and reported like the existing ones.
+        """
+        User = self.model._meta.get_field('receiver').related_model
+        Friendship = self.model._meta.apps.get_model('friend', 'Friendship')
+        friend_ids = Friendship.objects.cached_friend_ids(sender.pk)
+
+        receivers = {user.public_id: user for user in User.objects.filter(public_id__in=receiver_public_ids)}
+        receiver_ids = [user.pk for user in receivers.values()]
+
+        invited_ids, inviting_ids = set(), set()
+        for sender_id, receiver_id in self.filter(
+            Q(sender=sender, receiver__in=receiver_ids) | Q(sender__in=receiver_ids, receiver=sender)
+        ).values_list('sender_id', 'receiver_id'):
+            if sender_id == sender.pk:
+                invited_ids.add(receiver_id)
+            else:
+                inviting_ids.add(sender_id)
+
+        results, invitations = {}, []
+        for public_id in dict.fromkeys(receiver_public_ids):
+            receiver = receivers.get(public_id)
+
+            if receiver is None:
+                results[public_id] = (self.NOT_FOUND, None)
+            elif receiver.pk == sender.pk:
+                results[public_id] = (self.SELF, None)
+            elif receiver.pk in friend_ids:
+                results[public_id] = (self.ALREADY_FRIENDS, None)
+            elif receiver.pk in invited_ids:
+                results[public_id] = (self.ALREADY_INVITED, None)
+            elif receiver.pk in inviting_ids:
+                results[public_id] = (self.INVITED_YOU, None)
+            else:
+                invitation = self.model(sender=sender, receiver=receiver)
+                invitations.append(invitation)
+                results[public_id] = (self.CREATED, invitation)
+
+        if invitations:
+            self.bulk_create(invitations, ignore_conflicts=True)
+            self.resolve_conflicts(sender, invitations, results)
+
+        return results
+
+    def resolve_conflicts(self, sender, invitations, results):
+        """
+        Sets the primary keys of the inserted invitations and marks the ones the insert skipped,
+        because an invitation between the same users was created in the meantime.
+        """
+        receiver_ids = [invitation.receiver_id for invitation in invitations]
+        stored, inviting_ids = {}, set()
+        for pk, sender_id, receiver_id, created_at in self.filter(
+            Q(sender=sender, receiver__in=receiver_ids) | Q(sender__in=receiver_ids, receiver=sender)
+        ).values_list('pk', 'sender_id', 'receiver_id', 'created_at'):
+            if sender_id == sender.pk:
+                stored[receiver_id] = (pk, created_at)
+            else:
+                inviting_ids.add(sender_id)
+
+        for invitation in invitations:
+            pk, created_at = stored.get(invitation.receiver_id, (None, None))
+            public_id = invitation.receiver.public_id
+
+            if pk is not None and created_at == invitation.created_at:
+                invitation.pk = pk
+            elif invitation.receiver_id in inviting_ids:
+                results[public_id] = (self.INVITED_YOU, None)
+            else:
+                results[public_id] = (self.ALREADY_INVITED, None)
@@ -0,0 +1,63 @@
+# Generated by Django 4.1.9 on 2026-10-17 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('friend', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Friendship',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user1', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user2', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='friendship',
+            index=models.Index(fields=['user2', 'user1'], name='friendship_user2_user1_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='friendship',
+            constraint=models.UniqueConstraint(fields=('user1', 'user2'), name='friendship_unique_pair'),
+        ),
+        migrations.AddConstraint(
+            model_name='friendship',
+            constraint=models.CheckConstraint(check=models.Q(('user1__lt', models.F('user2'))), name='friendship_ordered_pair'),
+        ),
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO friend_friendship (user1_id, user2_id, created_at)
+                SELECT DISTINCT LEAST(friends_list.user_id, friends.user_id),
+                                GREATEST(friends_list.user_id, friends.user_id),
+                                NOW()
+                FROM friend_friendslist_friends friends
+                JOIN friend_friendslist friends_list ON friends_list.id = friends.friendslist_id
+                WHERE friends_list.user_id <> friends.user_id
+                ON CONFLICT DO NOTHING;
+            """,
+            reverse_sql="""
+                INSERT INTO friend_friendslist_friends (friendslist_id, user_id)
+                SELECT friends_list.id, friendship.user2_id
+                FROM friend_friendship friendship
+                JOIN friend_friendslist friends_list ON friends_list.user_id = friendship.user1_id
+                UNION
+                SELECT friends_list.id, friendship.user1_id
+                FROM friend_friendship friendship
+                JOIN friend_friendslist friends_list ON friends_list.user_id = friendship.user2_id;
+            """,
+        ),
+        migrations.RemoveField(
+            model_name='friendslist',
+            name='friends',
+        ),
+    ]
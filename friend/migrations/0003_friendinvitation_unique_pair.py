@@ -0,0 +1,28 @@
+# Generated by Django 4.1.9 on 2026-10-17 12:00
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('friend', '0002_friendship'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                DELETE FROM friend_friendinvitation duplicate
+                USING friend_friendinvitation original
+                WHERE LEAST(duplicate.sender_id, duplicate.receiver_id) = LEAST(original.sender_id, original.receiver_id)
+                  AND GREATEST(duplicate.sender_id, duplicate.receiver_id) = GREATEST(original.sender_id, original.receiver_id)
+                  AND duplicate.id > original.id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name='friendinvitation',
+            constraint=models.UniqueConstraint(django.db.models.functions.comparison.Least('sender', 'receiver'), django.db.models.functions.comparison.Greatest('sender', 'receiver'), name='friendinvitation_unique_pair'),
+        ),
+    ]
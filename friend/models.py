@@ -1,27 +1,55 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Greatest, Least
+
+from .graph import friend_graph
+from .managers import FriendInvitationManager, FriendshipManager
 
 
 class FriendsList(models.Model):
     user = models.OneToOneField('user.User', on_delete=models.CASCADE, related_name='friends_list')
-    friends = models.ManyToManyField('user.User', blank=True)
 
     def __str__(self):
         return f'Friends list - {self.user.email}'
 
-    def add_friend(self, friend):
-        self.friends.add(friend)
-        friend.friends_list.friends.add(self.user)
+    @property
+    def friends(self):
+        """
+        Users who are friends with the owner of the list. Friendships themselves are stored in `Friendship`.
+        """
+        return Friendship.objects.friends_of(self.user_id)
 
-        self.save()
+    def add_friend(self, friend):
+        Friendship.objects.add(self.user_id, friend.pk)
+        Friendship.objects.invalidate_friend_ids(self.user_id, friend.pk)
+        transaction.on_commit(lambda: friend_graph.add_edge(self.user_id, friend.pk))
 
     def remove_friend(self, friend):
-        self.friends.remove(friend)
-        friend.friends_list.friends.remove(self.user)
-
-        self.save()
+        Friendship.objects.remove(self.user_id, friend.pk)
+        Friendship.objects.invalidate_friend_ids(self.user_id, friend.pk)
+        transaction.on_commit(lambda: friend_graph.remove_edge(self.user_id, friend.pk))
 
     def is_friend(self, friend):
-        return friend in self.friends.all()
+        return friend.pk in Friendship.objects.cached_friend_ids(self.user_id)
+
+
+class Friendship(models.Model):
+    user1 = models.ForeignKey('user.User', on_delete=models.CASCADE, related_name='+', db_index=False)
+    user2 = models.ForeignKey('user.User', on_delete=models.CASCADE, related_name='+', db_index=False)
+    created_at = models.DateTimeField(auto_now_add=True, editable=False)
+
+    objects = FriendshipManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user1', 'user2'], name='friendship_unique_pair'),
+            models.CheckConstraint(check=models.Q(user1__lt=models.F('user2')), name='friendship_ordered_pair'),
+        ]
+        indexes = [
+            models.Index(fields=['user2', 'user1'], name='friendship_user2_user1_idx'),
+        ]
+
+    def __str__(self):
+        return f'Friendship between {self.user1_id} and {self.user2_id}'
 
 
 class FriendInvitation(models.Model):
@@ -29,6 +57,14 @@ class FriendInvitation(models.Model):
     receiver = models.ForeignKey('user.User', on_delete=models.CASCADE, related_name='invitations')
     created_at = models.DateTimeField(auto_now=True, editable=False)
 
+    objects = FriendInvitationManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(Least('sender', 'receiver'), Greatest('sender', 'receiver'),
+                                    name='friendinvitation_unique_pair'),
+        ]
+
     def __str__(self):
         return f'Friend invitation from f{self.sender.email} to {self.receiver.email}'
 
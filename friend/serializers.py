@@ -2,6 +2,7 @@ from django.contrib.auth import get_user_model
 from django.utils.translation import gettext as _
 from rest_framework import serializers
 
+from LiquorLovers.serializers import ImageVariantsField, UniqueCreateMixin
 from .models import FriendsList, FriendInvitation
 
 
@@ -9,11 +10,22 @@ User = get_user_model()
 
 
 class FriendSerializer(serializers.ModelSerializer):
+    variants = ImageVariantsField('pfp', 'pfp_status')
+
     class Meta:
         model = User
-        fields = ['public_id', 'username', 'first_name', 'last_name', 'date_of_birth', 'pfp']
+        fields = ['public_id', 'username', 'first_name', 'last_name', 'date_of_birth', 'pfp', 'variants']
         read_only_fields = ('public_id', 'first_name', 'last_name', 'date_of_birth', 'pfp')
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+
+        mutual_friends_count = getattr(instance, 'mutual_friends_count', None)
+        if mutual_friends_count is not None:
+            data['mutual_friends_count'] = mutual_friends_count
+
+        return data
+
 
 class FriendsListSerializer(serializers.ModelSerializer):
     friends = FriendSerializer(many=True, read_only=True)
@@ -23,7 +35,7 @@ class FriendsListSerializer(serializers.ModelSerializer):
         fields = ['friends']
 
 
-class FriendInvitationSerializer(serializers.ModelSerializer):
+class FriendInvitationSerializer(UniqueCreateMixin, serializers.ModelSerializer):
     sender = FriendSerializer(read_only=True)
     sender_public_id = serializers.SlugRelatedField(
         source='sender', queryset=User.objects.all(), slug_field='public_id', write_only=True
@@ -39,19 +51,20 @@ class FriendInvitationSerializer(serializers.ModelSerializer):
         fields = ['id', 'sender', 'receiver', 'receiver_public_id', 'sender_public_id', 'created_at']
 
     def validate(self, attrs):
-        invitation = FriendInvitation.objects.filter(sender=attrs['sender'],
-                                                     receiver=attrs['receiver'])
+        if attrs['sender'] == attrs['receiver']:
+            raise serializers.ValidationError(_('You can not invite yourself. '))
 
-        if invitation.exists():
-            raise serializers.ValidationError(_('Invitation like this already exists. '))
+        return attrs
 
-        invitation = FriendInvitation.objects.filter(receiver=attrs['sender'],
-                                                     sender=attrs['receiver'])
+    def get_integrity_error_message(self, validated_data):
+        invitation = FriendInvitation.objects.filter(receiver=validated_data['sender'],
+                                                     sender=validated_data['receiver'])
 
         if invitation.exists():
-            raise serializers.ValidationError(_('The receiver already invited you. '))
+            return _('The receiver already invited you. ')
 
-        if attrs['sender'] == attrs['receiver']:
-            raise serializers.ValidationError(_('You can not invite yourself. '))
+        return super().get_integrity_error_message(validated_data)
 
-        return attrs
+
+class FriendInvitationBulkSerializer(serializers.Serializer):
+    receiver_public_ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=100)
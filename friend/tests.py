@@ -4,7 +4,8 @@ from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from friend.models import FriendInvitation
+from friend.graph import friend_graph
+from friend.models import Friendship, FriendInvitation
 
 User = get_user_model()
 
@@ -43,6 +44,220 @@ class FriendTest(APITestCase):
         self.assertEqual(response.data['results'][0]['public_id'], str(friend.public_id))
         self.assertEqual(response.data['results'][1]['public_id'], str(friend1.public_id))
 
+    def test_list_friends_pagination(self):
+        url = '/friends/'
+
+        user = User.objects.create_user(email='user@user.com',
+                                        username='username',
+                                        password='Password&1976',
+                                        date_of_birth=datetime.date(2000, 1, 1))
+
+        friend = User.objects.create_user(email='friend@friend.com',
+                                          username='friend',
+                                          password='Password&1976',
+                                          date_of_birth=datetime.date(2000, 1, 1))
+
+        friend1 = User.objects.create_user(email='friend1@friend1.com',
+                                           username='friend1',
+                                           password='Password&1976',
+                                           date_of_birth=datetime.date(2000, 1, 1))
+
+        user.friends_list.add_friend(friend)
+        user.friends_list.add_friend(friend1)
+
+        data = {'email': user.email, 'password': 'Password&1976'}
+        jwt = self.client.post('/auth/token/', data, format='json').data['access']
+
+        response = self.client.get(url, format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+
+        self.assertNotIn('count', response.data)
+        self.assertIsNone(response.data['next'])
+
+        response = self.client.get(f'{url}?limit=1&offset=1', format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['public_id'], str(friend1.public_id))
+
+    def test_friend_ids(self):
+        user = User.objects.create_user(email='user@user.com',
+                                        username='username',
+                                        password='Password&1976',
+                                        date_of_birth=datetime.date(2000, 1, 1))
+
+        friend = User.objects.create_user(email='friend@friend.com',
+                                          username='friend',
+                                          password='Password&1976',
+                                          date_of_birth=datetime.date(2000, 1, 1))
+
+        stranger = User.objects.create_user(email='stranger@stranger.com',
+                                            username='stranger',
+                                            password='Password&1976',
+                                            date_of_birth=datetime.date(2000, 1, 1))
+
+        user.friends_list.add_friend(friend)
+        friend.friends_list.add_friend(user)
+
+        self.assertEqual(Friendship.objects.count(), 1)
+        self.assertTrue(user.friends_list.is_friend(friend))
+        self.assertTrue(friend.friends_list.is_friend(user))
+        self.assertFalse(user.friends_list.is_friend(stranger))
+        self.assertEqual(list(friend.friends_list.friends), [user])
+
+        with self.assertNumQueries(1):
+            self.assertEqual(Friendship.objects.friend_ids(user), {friend.id})
+
+        self.assertEqual(Friendship.objects.friend_ids(friend), {user.id})
+        self.assertEqual(Friendship.objects.friend_ids(stranger), set())
+
+    def test_cached_friend_ids(self):
+        user = User.objects.create_user(email='user@user.com',
+                                        username='username',
+                                        password='Password&1976',
+                                        date_of_birth=datetime.date(2000, 1, 1))
+
+        friend = User.objects.create_user(email='friend@friend.com',
+                                          username='friend',
+                                          password='Password&1976',
+                                          date_of_birth=datetime.date(2000, 1, 1))
+
+        self.assertEqual(Friendship.objects.cached_friend_ids(user.id), frozenset())
+
+        FriendInvitation.objects.create(sender=user, receiver=friend).accept()
+
+        self.assertEqual(Friendship.objects.cached_friend_ids(user.id), frozenset([friend.id]))
+        with self.assertNumQueries(0):
+            self.assertEqual(Friendship.objects.cached_friend_ids(user.id), frozenset([friend.id]))
+
+        user.friends_list.remove_friend(friend)
+
+        self.assertEqual(Friendship.objects.cached_friend_ids(user.id), frozenset())
+        self.assertEqual(Friendship.objects.cached_friend_ids(friend.id), frozenset())
+
+    def test_mutual_friends(self):
+        url = '/friends/'
+
+        user = User.objects.create_user(email='user@user.com',
+                                        username='username',
+                                        password='Password&1976',
+                                        date_of_birth=datetime.date(2000, 1, 1))
+
+        other = User.objects.create_user(email='other@other.com',
+                                         username='other',
+                                         password='Password&1976',
+                                         date_of_birth=datetime.date(2000, 1, 1))
+
+        mutual_friend = User.objects.create_user(email='mutual@mutual.com',
+                                                 username='mutual',
+                                                 password='Password&1976',
+                                                 date_of_birth=datetime.date(2000, 1, 1))
+
+        friend = User.objects.create_user(email='friend@friend.com',
+                                          username='friend',
+                                          password='Password&1976',
+                                          date_of_birth=datetime.date(2000, 1, 1))
+
+        user.friends_list.add_friend(mutual_friend)
+        user.friends_list.add_friend(friend)
+        other.friends_list.add_friend(mutual_friend)
+        friend.friends_list.add_friend(mutual_friend)
+
+        data = {'email': user.email, 'password': 'Password&1976'}
+        jwt = self.client.post('/auth/token/', data, format='json').data['access']
+
+        response = self.client.get(f'{url}{other.public_id}/mutual/', format='json',
+                                   HTTP_AUTHORIZATION=f'Bearer {jwt}')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['public_id'], str(mutual_friend.public_id))
+
+        response = self.client.get(url, format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+
+        mutual_friends_counts = {result['public_id']: result['mutual_friends_count']
+                                 for result in response.data['results']}
+        self.assertEqual(mutual_friends_counts, {str(mutual_friend.public_id): 1, str(friend.public_id): 1})
+
+    def test_friend_suggestions(self):
+        url = '/friends/suggestions/'
+
+        user = User.objects.create_user(email='user@user.com',
+                                        username='username',
+                                        password='Password&1976',
+                                        date_of_birth=datetime.date(2000, 1, 1))
+
+        friends = [User.objects.create_user(email=f'friend{i}@friend.com',
+                                            username=f'friend{i}',
+                                            password='Password&1976',
+                                            date_of_birth=datetime.date(2000, 1, 1)) for i in range(2)]
+
+        close = User.objects.create_user(email='close@close.com',
+                                         username='close',
+                                         password='Password&1976',
+                                         date_of_birth=datetime.date(2000, 1, 1))
+
+        distant = User.objects.create_user(email='distant@distant.com',
+                                           username='distant',
+                                           password='Password&1976',
+                                           date_of_birth=datetime.date(2000, 1, 1))
+
+        for friend in friends:
+            user.friends_list.add_friend(friend)
+            close.friends_list.add_friend(friend)
+        distant.friends_list.add_friend(friends[0])
+
+        friend_graph.build()
+
+        data = {'email': user.email, 'password': 'Password&1976'}
+        jwt = self.client.post('/auth/token/', data, format='json').data['access']
+
+        response = self.client.get(url, format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([(result['public_id'], result['mutual_friends_count']) for result in response.data],
+                         [(str(close.public_id), 2), (str(distant.public_id), 1)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.friends_list.add_friend(distant)
+
+        response = self.client.get(url, format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+
+        self.assertEqual([result['public_id'] for result in response.data], [str(close.public_id)])
+
+    def test_friendship_path(self):
+        url = '/friends/'
+
+        users = [User.objects.create_user(email=f'user{i}@user.com',
+                                          username=f'user{i}',
+                                          password='Password&1976',
+                                          date_of_birth=datetime.date(2000, 1, 1)) for i in range(5)]
+
+        for user, friend in zip(users, users[1:4]):
+            user.friends_list.add_friend(friend)
+
+        friend_graph.build()
+
+        data = {'email': users[0].email, 'password': 'Password&1976'}
+        jwt = self.client.post('/auth/token/', data, format='json').data['access']
+
+        response = self.client.get(f'{url}{users[3].public_id}/path/', format='json',
+                                   HTTP_AUTHORIZATION=f'Bearer {jwt}')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['degrees'], 3)
+        self.assertEqual([result['public_id'] for result in response.data['path']],
+                         [str(user.public_id) for user in users[:4]])
+
+        response = self.client.get(f'{url}{users[3].public_id}/path/', {'max_depth': 2}, format='json',
+                                   HTTP_AUTHORIZATION=f'Bearer {jwt}')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(f'{url}{users[4].public_id}/path/', format='json',
+                                   HTTP_AUTHORIZATION=f'Bearer {jwt}')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_unfriend(self):
         url = '/friends/'
 
@@ -167,6 +382,72 @@ class InvitationTests(APITestCase):
         self.assertEqual(response.data['results'][0]['sender']['public_id'], str(sender.public_id))
         self.assertEqual(response.data['results'][0]['receiver']['public_id'], str(receiver.public_id))
 
+    def test_bulk_create_invitations(self):
+        url = '/friends/invitations/bulk/'
+
+        sender = User.objects.create_user(email='sender@sender.com',
+                                          username='sender',
+                                          password='Password&1976',
+                                          date_of_birth=datetime.date(2000, 1, 1))
+
+        receivers = [User.objects.create_user(email=f'receiver{i}@receiver.com',
+                                              username=f'receiver{i}',
+                                              password='Password&1976',
+                                              date_of_birth=datetime.date(2000, 1, 1)) for i in range(4)]
+
+        FriendInvitation.objects.create(sender=sender, receiver=receivers[0])
+        FriendInvitation.objects.create(sender=receivers[1], receiver=sender)
+
+        data = {'email': sender.email, 'password': 'Password&1976'}
+        sender_jwt = self.client.post('/auth/token/', data, format='json').data['access']
+
+        missing_public_id = '00000000-0000-0000-0000-000000000000'
+        data = {'receiver_public_ids': [str(receiver.public_id) for receiver in receivers] +
+                                       [str(sender.public_id), missing_public_id]}
+
+        with self.assertNumQueries(6):
+            response = self.client.post(url, data, format='json', HTTP_AUTHORIZATION=f'Bearer {sender_jwt}')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([result['status'] for result in response.data['results']],
+                         ['already_invited', 'invited_you', 'created', 'created', 'self', 'not_found'])
+        self.assertEqual([result['id'] for result in response.data['results'][2:4]],
+                         [FriendInvitation.objects.get(sender=sender, receiver=receiver).pk
+                          for receiver in receivers[2:]])
+        self.assertEqual(FriendInvitation.objects.filter(sender=sender).count(), 3)
+
+        response = self.client.post(url, data, format='json', HTTP_AUTHORIZATION=f'Bearer {sender_jwt}')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(FriendInvitation.objects.filter(sender=sender).count(), 3)
+
+    def test_bulk_invite_conflicts(self):
+        sender = User.objects.create_user(email='sender@sender.com',
+                                          username='sender',
+                                          password='Password&1976',
+                                          date_of_birth=datetime.date(2000, 1, 1))
+
+        receivers = [User.objects.create_user(email=f'receiver{i}@receiver.com',
+                                              username=f'receiver{i}',
+                                              password='Password&1976',
+                                              date_of_birth=datetime.date(2000, 1, 1)) for i in range(3)]
+
+        invitations = [FriendInvitation(sender=sender, receiver=receiver) for receiver in receivers]
+        results = {receiver.public_id: (FriendInvitation.objects.CREATED, invitation)
+                   for receiver, invitation in zip(receivers, invitations)}
+
+        # Invitations created by concurrent requests after the lookup in `bulk_invite`
+        FriendInvitation.objects.create(sender=sender, receiver=receivers[0])
+        FriendInvitation.objects.create(sender=receivers[1], receiver=sender)
+
+        FriendInvitation.objects.bulk_create(invitations, ignore_conflicts=True)
+        FriendInvitation.objects.resolve_conflicts(sender, invitations, results)
+
+        self.assertEqual([results[receiver.public_id][0] for receiver in receivers],
+                         ['already_invited', 'invited_you', 'created'])
+        self.assertEqual(results[receivers[2].public_id][1].pk,
+                         FriendInvitation.objects.get(sender=sender, receiver=receivers[2]).pk)
+
     def test_invitation_reject(self):
         url = '/friends/invitations/'
 
@@ -4,11 +4,15 @@ from .views import InvitationViewSet, FriendViewSet
 
 urlpatterns = [
     path('', FriendViewSet.as_view({'get': 'list'})),
+    path('suggestions/', FriendViewSet.as_view({'get': 'suggestions'})),
     path('<uuid:public_id>/', FriendViewSet.as_view({'delete': 'destroy'})),
+    path('<uuid:public_id>/mutual/', FriendViewSet.as_view({'get': 'mutual'})),
+    path('<uuid:public_id>/path/', FriendViewSet.as_view({'get': 'path'})),
 
     path('invitations/', InvitationViewSet.as_view({'post': 'create',
                                                     'get': 'list',
                                                     'delete': 'destroy'})),
+    path('invitations/bulk/', InvitationViewSet.as_view({'post': 'bulk_create'})),
     path('invitations/my/', InvitationViewSet.as_view({'get': 'list_from_me'})),
     path('invitations/<int:pk>/', InvitationViewSet.as_view({'post': 'accept',
                                                              'delete': 'destroy'}))
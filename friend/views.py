@@ -5,8 +5,10 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 
-from .serializers import FriendInvitationSerializer, FriendSerializer
-from .models import FriendInvitation
+from LiquorLovers.pagination import KeysetPagination
+from .serializers import FriendInvitationBulkSerializer, FriendInvitationSerializer, FriendSerializer
+from .graph import friend_graph
+from .models import Friendship, FriendInvitation
 
 
 User = get_user_model()
@@ -17,12 +19,59 @@ class FriendViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = FriendSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    SUGGESTIONS_LIMIT = 20
+    SUGGESTIONS_MAX_LIMIT = 100
+    PATH_MAX_DEPTH = 6
 
     def list(self, request, *args, **kwargs):
         """
         Retrieves the list of friends for the current user.
         """
-        queryset = self.filter_queryset(request.user.friends_list.friends.all())
+        queryset = Friendship.objects.friends_of(request.user)
+        queryset = self.filter_queryset(Friendship.objects.annotate_mutual_friends_count(queryset, request.user))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['GET'])
+    def suggestions(self, request, *args, **kwargs):
+        """
+        Retrieves friends of friends of the current user, ranked by the number of friends they share with the user.
+        """
+        try:
+            limit = min(int(request.query_params.get('limit', self.SUGGESTIONS_LIMIT)), self.SUGGESTIONS_MAX_LIMIT)
+        except ValueError:
+            return Response({'detail': _('Limit must be an integer. ')}, status=status.HTTP_400_BAD_REQUEST)
+
+        excluded_ids = Friendship.objects.cached_friend_ids(request.user.pk)
+        suggestions = dict(friend_graph.suggestions(request.user.pk, max(limit, 0), exclude=excluded_ids))
+
+        users = User.objects.in_bulk(suggestions.keys())
+        suggested_users = []
+        for user_id, mutual_friends_count in suggestions.items():
+            if user_id in users:
+                users[user_id].mutual_friends_count = mutual_friends_count
+                suggested_users.append(users[user_id])
+
+        serializer = self.get_serializer(suggested_users, many=True)
+        return Response(serializer.data)
+
+    @action(detail=True, methods=['GET'])
+    def mutual(self, request, *args, **kwargs):
+        """
+        Retrieves the list of mutual friends of the current user and the user specified by public_id.
+        """
+        other = self.get_object()
+
+        queryset = Friendship.objects.mutual_friends(request.user, other)
+        queryset = self.filter_queryset(Friendship.objects.annotate_mutual_friends_count(queryset, request.user))
 
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -32,6 +81,31 @@ class FriendViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['GET'])
+    def path(self, request, *args, **kwargs):
+        """
+        Retrieves the shortest chain of friends between the current user and the user specified by public_id.
+        """
+        other = self.get_object()
+
+        try:
+            max_depth = min(int(request.query_params.get('max_depth', self.PATH_MAX_DEPTH)), self.PATH_MAX_DEPTH)
+        except ValueError:
+            return Response({'detail': _('Max depth must be an integer. ')}, status=status.HTTP_400_BAD_REQUEST)
+
+        path = friend_graph.shortest_path(request.user.pk, other.pk, max(max_depth, 0))
+        if path is None:
+            return Response({'detail': _('No friendship path found within the given depth. ')},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        users = User.objects.in_bulk(path)
+        if len(users) != len(path):
+            return Response({'detail': _('No friendship path found within the given depth. ')},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        serializer = self.get_serializer([users[user_id] for user_id in path], many=True)
+        return Response({'degrees': len(path) - 1, 'path': serializer.data})
+
     def destroy(self, request, *args, **kwargs):
         """
         Removes a friend from the current user's friend list.
@@ -51,6 +125,7 @@ class InvitationViewSet(viewsets.ModelViewSet):
     queryset = FriendInvitation.objects.all()
     serializer_class = FriendInvitationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def create(self, request, *args, **kwargs):
         """
@@ -61,6 +136,28 @@ class InvitationViewSet(viewsets.ModelViewSet):
         self.perform_create(serializer)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=['POST'])
+    def bulk_create(self, request, *args, **kwargs):
+        """
+        Handles the creation of friend invitations for a list of receivers, reporting the result for each of them.
+        """
+        serializer = FriendInvitationBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results = FriendInvitation.objects.bulk_invite(request.user, serializer.validated_data['receiver_public_ids'])
+
+        data = []
+        for public_id, (result, invitation) in results.items():
+            item = {'receiver_public_id': str(public_id), 'status': result}
+            if invitation is not None:
+                item['id'] = invitation.pk
+            else:
+                item['detail'] = FriendInvitation.objects.MESSAGES[result]
+            data.append(item)
+
+        created = any(invitation is not None for _result, invitation in results.values())
+        return Response({'results': data}, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
     def list(self, request, *args, **kwargs):
         """
         Retrieves the list of friend invitations for the current user.
@@ -1,6 +1,11 @@
 from django.apps import AppConfig
 
+from LiquorLovers.storage import track_files
+
 
 class PartyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'party'
+
+    def ready(self):
+        track_files(self.get_model('Party'), 'image')
@@ -0,0 +1,36 @@
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from django_filters import rest_framework as filters
+
+from .models import Party
+
+
+class PartyFilter(filters.FilterSet):
+    """
+    Filters parties by the time window they happen in.
+    """
+    UPCOMING = 'upcoming'
+    ONGOING = 'ongoing'
+    PAST = 'past'
+
+    when = filters.ChoiceFilter(choices=[(UPCOMING, _('Upcoming')),
+                                         (ONGOING, _('Ongoing')),
+                                         (PAST, _('Past'))],
+                                method='filter_when')
+    start_after = filters.IsoDateTimeFilter(field_name='start_time', lookup_expr='gte')
+    start_before = filters.IsoDateTimeFilter(field_name='start_time', lookup_expr='lte')
+
+    class Meta:
+        model = Party
+        fields = ['when', 'start_after', 'start_before']
+
+    def filter_when(self, queryset, name, value):
+        now = timezone.now()
+
+        if value == self.UPCOMING:
+            return queryset.filter(start_time__gt=now)
+
+        if value == self.ONGOING:
+            return queryset.filter(start_time__lte=now, stop_time__gt=now)
+
+        return queryset.filter(stop_time__lte=now)
@@ -0,0 +1,123 @@
+from django.contrib.gis.db import models
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db import transaction
+from django.db.models import Count, Exists, F, FloatField, Func, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, JSONObject
+
+from friend.models import Friendship
+
+PARTICIPANTS_PREVIEW_SIZE = 10
+PARTICIPANTS_PREVIEW_FIELDS = ('public_id', 'username', 'first_name', 'last_name', 'date_of_birth', 'pfp',
+                               'pfp_status')
+
+
+class KNNDistance(Func):
+    """
+    PostGIS `<->` operator. Used in ORDER BY it is answered by the spatial index, nearest rows first.
+    """
+    arg_joiner = ' <-> '
+    template = '(%(expressions)s)'
+    output_field = FloatField()
+
+
+class PartyQuerySet(models.QuerySet):
+    """
+    Custom party queryset which allows to filter parties on the database side.
+    """
+    def with_related(self):
+        """
+        Loads the owner, the participant count and a capped participant preview nested by `PartySerializer`
+        up front, so serializing a page of parties costs a fixed number of queries regardless of party size.
+        """
+        participants = self.model.participants.through.objects.filter(party=OuterRef('pk'))
+        participants_count = participants.values('party').annotate(count=Count('pk')).values('count')
+        participants_preview = participants.order_by('user_id').values(
+            json=JSONObject(**{field: f'user__{field}' for field in PARTICIPANTS_PREVIEW_FIELDS})
+        )[:PARTICIPANTS_PREVIEW_SIZE]
+
+        return self.select_related('owner').annotate(
+            participants_count=Coalesce(Subquery(participants_count), 0),
+            participants_preview=ArraySubquery(participants_preview),
+        )
+
+    def visible_to(self, user):
+        """
+        Returns the parties that the given user is allowed to see.
+        Mirrors `Party.can_see_party` so it can be evaluated in a single query.
+        """
+        is_owner_friend = Friendship.objects.filter(Q(user1=OuterRef('owner'), user2=user) |
+                                                    Q(user1=user, user2=OuterRef('owner')))
+        is_participant = self.model.participants.through.objects.filter(party=OuterRef('pk'), user=user)
+
+        return self.filter(
+            Q(privacy_status=self.model.PrivacyStatus.PUBLIC) |
+            Q(owner=user) |
+            Q(privacy_status=self.model.PrivacyStatus.PRIVATE) & Exists(is_owner_friend) |
+            Q(privacy_status=self.model.PrivacyStatus.SECRET) & Exists(is_participant)
+        )
+
+    def nearest_to(self, point):
+        """
+        Orders the parties by their distance in meters to the given point, using KNN search over the geography index.
+        The distance is annotated as `knn_distance` and ties are broken by id, so the order is stable for keyset paging.
+        """
+        point = Value(point, output_field=models.PointField(geography=True))
+        return self.annotate(knn_distance=KNNDistance(F('location_geography'), point)).order_by('knn_distance', 'id')
+
+
+class PartyInvitationManager(models.Manager):
+    """
+    Custom party invitation manager.
+    """
+    def bulk_invite(self, party, users):
+        """
+        Invites the users from the given queryset to the party and returns the list of invited users' public ids.
+        The owner, participants and users with a pending invitation are skipped by a single anti-join query
+        and the invitations are inserted with a single `bulk_create`.
+        """
+        participants = party.participants.through.objects.filter(party=party, user=OuterRef('pk'))
+        invitations = self.filter(party=party, receiver=OuterRef('pk'))
+
+        receivers = list(
+            users.exclude(pk=party.owner_id)
+            .exclude(Exists(participants))
+            .exclude(Exists(invitations))
+            .values_list('pk', 'public_id')
+        )
+
+        self.bulk_create([self.model(party=party, receiver_id=pk) for pk, _public_id in receivers],
+                         ignore_conflicts=True)
+        return [public_id for _pk, public_id in receivers]
+
+
+class PartyRequestManager(models.Manager):
+    """
+    Custom party request manager.
+    """
+    def accept_batch(self, party, requests):
+        """
+        Accepts the given requests of the party in one transaction and returns the ids of the accepted requests.
+        The requests are locked, their senders are added to the participants with a single insert
+        and the requests are removed with a single delete.
+        """
+        with transaction.atomic():
+            accepted = list(requests.filter(party=party).select_for_update().values_list('pk', 'sender_id'))
+
+            Participant = party.participants.through
+            Participant.objects.bulk_create([Participant(party_id=party.pk, user_id=sender_id)
+                                             for _pk, sender_id in accepted], ignore_conflicts=True)
+
+            request_ids = [pk for pk, _sender_id in accepted]
+            self.filter(pk__in=request_ids).delete()
+
+        return request_ids
+
+    def reject_batch(self, party, requests):
+        """
+        Rejects the given requests of the party with a single delete and returns the ids of the rejected requests.
+        """
+        with transaction.atomic():
+            request_ids = list(requests.filter(party=party).select_for_update().values_list('pk', flat=True))
+            self.filter(pk__in=request_ids).delete()
+
+        return request_ids
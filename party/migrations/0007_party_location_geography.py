@@ -0,0 +1,19 @@
+# Generated by Django 4.1.9 on 2026-10-17 12:00
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('party', '0006_rename_localization_party_location_alter_party_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='party',
+            name='location_geography',
+            field=django.contrib.gis.db.models.fields.PointField(editable=False, geography=True, null=True, srid=4326),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.contrib.gis.db.models import PointField
+from django.db import migrations
+from django.db.models.functions import Cast
+
+BATCH_SIZE = 1000
+
+
+def backfill_location_geography(apps, schema_editor):
+    """
+    Copies `location` into `location_geography` in batches, so each batch runs in its own short transaction.
+    """
+    Party = apps.get_model('party', 'Party')
+
+    last_id = 0
+    while True:
+        ids = list(Party.objects.filter(id__gt=last_id, location_geography__isnull=True)
+                   .order_by('id')
+                   .values_list('id', flat=True)[:BATCH_SIZE])
+        if not ids:
+            break
+
+        Party.objects.filter(id__in=ids).update(location_geography=Cast('location', PointField(geography=True)))
+        last_id = ids[-1]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('party', '0007_party_location_geography'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_location_geography, migrations.RunPython.noop),
+    ]
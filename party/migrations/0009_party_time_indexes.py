@@ -0,0 +1,21 @@
+# Generated by Django 4.1.9 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('party', '0008_backfill_party_location_geography'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='party',
+            index=models.Index(fields=['privacy_status', 'start_time'], name='party_privacy_start_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='party',
+            index=models.Index(fields=['stop_time'], name='party_stop_time_idx'),
+        ),
+    ]
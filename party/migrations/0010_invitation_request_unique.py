@@ -0,0 +1,41 @@
+# Generated by Django 4.1.9 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('party', '0009_party_time_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                DELETE FROM party_partyinvitation duplicate
+                USING party_partyinvitation original
+                WHERE duplicate.party_id = original.party_id
+                  AND duplicate.receiver_id = original.receiver_id
+                  AND duplicate.id > original.id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            sql="""
+                DELETE FROM party_partyrequest duplicate
+                USING party_partyrequest original
+                WHERE duplicate.party_id = original.party_id
+                  AND duplicate.sender_id = original.sender_id
+                  AND duplicate.id > original.id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name='partyinvitation',
+            constraint=models.UniqueConstraint(fields=('party', 'receiver'), name='partyinvitation_unique_party_receiver'),
+        ),
+        migrations.AddConstraint(
+            model_name='partyrequest',
+            constraint=models.UniqueConstraint(fields=('party', 'sender'), name='partyrequest_unique_party_sender'),
+        ),
+    ]
@@ -2,9 +2,13 @@ import uuid
 
 from django.contrib.gis.db import models
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.utils.translation import gettext as _
 
+from LiquorLovers.images import ImageStatus
 from LiquorLovers.utils import uuid_upload_to
+from friend.models import Friendship
+from .managers import PartyInvitationManager, PartyQuerySet, PartyRequestManager
 
 User = get_user_model()
 
@@ -21,32 +25,49 @@ class Party(models.Model):
     privacy_status = models.IntegerField(choices=PrivacyStatus.choices, default=PrivacyStatus.PRIVATE)
     description = models.TextField(max_length=500)
     image = models.ImageField(upload_to=uuid_upload_to('parties'), default='defaults/parties/default.png')
+    image_status = models.CharField(max_length=10, choices=ImageStatus.choices, default=ImageStatus.READY,
+                                    editable=False)
     participants = models.ManyToManyField(User, related_name='parties')
     location = models.PointField(null=False, blank=False)
+    location_geography = models.PointField(geography=True, null=True, editable=False)
     start_time = models.DateTimeField()
     stop_time = models.DateTimeField()
 
+    objects = PartyQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['privacy_status', 'start_time'], name='party_privacy_start_time_idx'),
+            models.Index(fields=['stop_time'], name='party_stop_time_idx'),
+        ]
+
     def __str__(self):
         return f'{self.owner.email} - {self.name}'
 
     def can_see_party(self, user):
         if self.privacy_status == self.PrivacyStatus.SECRET:
-            return user in self.participants.all() or user == self.owner
+            return user == self.owner or self.participants.filter(pk=user.pk).exists()
 
         if self.privacy_status == self.PrivacyStatus.PRIVATE:
-            return self.owner.friends_list.is_friend(user) or user == self.owner
+            return user == self.owner or user.pk in Friendship.objects.cached_friend_ids(self.owner_id)
 
         return True
 
     def add_participant(self, participant):
-        self.participants.add(participant)
-        self.save()
+        """
+        Adds the participant with a single `INSERT ... ON CONFLICT DO NOTHING`, without saving the party row.
+        """
+        Participant = self.participants.through
+        Participant.objects.bulk_create([Participant(party_id=self.pk, user_id=participant.pk)], ignore_conflicts=True)
+
+    def save(self, *args, **kwargs):
+        self.location_geography = self.location
 
-    def delete(self, using=None, keep_parents=False):
-        if self.image.name != self.image.field.default:
-            self.image.delete()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'location' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'location_geography'}
 
-        return super().delete(using, keep_parents)
+        return super().save(*args, **kwargs)
 
 
 class PartyInvitation(models.Model):
@@ -54,12 +75,27 @@ class PartyInvitation(models.Model):
     receiver = models.ForeignKey(User, related_name='party_invitations', on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now=True, editable=False)
 
+    objects = PartyInvitationManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['party', 'receiver'], name='partyinvitation_unique_party_receiver'),
+        ]
+
     def __str__(self):
         return f'Invitation to {self.party.name} to {self.receiver.username}'
 
     def accept(self):
-        self.party.add_participant(self.receiver)
-        self.delete()
+        """
+        Deletes the invitation and adds the receiver to the party in one transaction.
+        Accepting an invitation that was already accepted does nothing and returns False.
+        """
+        with transaction.atomic():
+            deleted, _deleted_per_model = PartyInvitation.objects.filter(pk=self.pk).delete()
+            if deleted:
+                self.party.add_participant(self.receiver)
+
+        return bool(deleted)
 
     def reject(self):
         self.delete()
@@ -70,12 +106,27 @@ class PartyRequest(models.Model):
     sender = models.ForeignKey(User, related_name='party_requests', on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now=True, editable=False)
 
+    objects = PartyRequestManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['party', 'sender'], name='partyrequest_unique_party_sender'),
+        ]
+
     def __str__(self):
         return f'Request from {self.user.username} to {self.party.name}'
 
     def accept(self):
-        self.party.add_participant(self.sender)
-        self.delete()
+        """
+        Deletes the request and adds the sender to the party in one transaction.
+        Accepting a request that was already accepted does nothing and returns False.
+        """
+        with transaction.atomic():
+            deleted, _deleted_per_model = PartyRequest.objects.filter(pk=self.pk).delete()
+            if deleted:
+                self.party.add_participant(self.sender)
+
+        return bool(deleted)
 
     def reject(self):
         self.delete()
@@ -0,0 +1,68 @@
+from base64 import b64decode, b64encode
+
+from django.db.models import Q
+from django.utils.translation import gettext as _
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class NearestKeysetPagination(BasePagination):
+    """
+    Keyset pagination over parties ordered by `PartyQuerySet.nearest_to`.
+    The cursor holds the (distance, id) of the last party of the page, so the next page continues right after it.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'k'
+    page_size = 20
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor is not None:
+            knn_distance, party_id = self.decode_cursor(cursor)
+            queryset = queryset.filter(Q(knn_distance__gt=knn_distance) | Q(knn_distance=knn_distance, id__gt=party_id))
+
+        page = list(queryset[:page_size + 1])
+        self.next_cursor = None
+        if len(page) > page_size:
+            page = page[:page_size]
+            self.next_cursor = self.encode_cursor(page[-1].knn_distance, page[-1].id)
+
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            raise ValidationError({"msg": f"{self.page_size_query_param} must be an integer."})
+
+        if page_size < 1:
+            raise ValidationError({"msg": f"{self.page_size_query_param} must be positive."})
+
+        return min(page_size, self.max_page_size)
+
+    @staticmethod
+    def encode_cursor(knn_distance, party_id):
+        return b64encode(f'{knn_distance!r}:{party_id}'.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            knn_distance, party_id = b64decode(cursor.encode(), validate=True).decode().split(':')
+            return float(knn_distance), int(party_id)
+        except ValueError:
+            raise NotFound(_('Invalid cursor'))
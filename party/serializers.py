@@ -2,11 +2,15 @@ from math import floor
 
 from django.contrib.auth import get_user_model
 from django.contrib.gis.geos import GEOSGeometry
-from django.utils.translation import gettext as _
+from django.db import transaction
+from django.utils.translation import gettext as _, gettext_lazy
 from geopy.distance import distance
 from rest_framework import serializers
 
+from LiquorLovers.images import ImageStatus, fit_within, process_image_later
+from LiquorLovers.serializers import ImageVariantsField, UniqueCreateMixin
 from user.serializers import FriendSerializer
+from .managers import PARTICIPANTS_PREVIEW_SIZE
 from .models import Party, PartyInvitation, PartyRequest
 
 User = get_user_model()
@@ -18,10 +22,12 @@ class PartySerializer(serializers.ModelSerializer):
         source='owner', queryset=User.objects.all(), slug_field='public_id', write_only=True
     )
 
-    participants = FriendSerializer(many=True, read_only=True)
+    participants = serializers.SerializerMethodField()
+    participants_count = serializers.SerializerMethodField()
     privacy_status_display = serializers.CharField(source='get_privacy_status_display', read_only=True)
 
     distance = serializers.SerializerMethodField()
+    variants = ImageVariantsField('image', 'image_status')
 
     class Meta:
         model = Party
@@ -34,7 +40,10 @@ class PartySerializer(serializers.ModelSerializer):
                   'privacy_status_display',
                   'description',
                   'image',
+                  'image_status',
+                  'variants',
                   'participants',
+                  'participants_count',
                   'location',
                   'distance',
                   'start_time',
@@ -42,6 +51,22 @@ class PartySerializer(serializers.ModelSerializer):
 
         read_only_fields = ('public_id', 'owner')
 
+    IMAGE_SIZE = (1920, 1920)
+
+    def save(self, **kwargs):
+        uploaded = bool(self.validated_data.get('image'))
+        if uploaded:
+            kwargs['image_status'] = ImageStatus.PROCESSING
+
+        # The file reference taken by the storage is committed together with the row
+        with transaction.atomic():
+            party = super().save(**kwargs)
+
+        if uploaded:
+            process_image_later(party, 'image', 'image_status', fit_within(self.IMAGE_SIZE))
+
+        return party
+
     def create(self, validated_data):
         validated_data['participants'] = validated_data.get('participants') or []
 
@@ -60,7 +85,29 @@ class PartySerializer(serializers.ModelSerializer):
 
         return data
 
+    def get_participants(self, obj):
+        """
+        Returns a capped preview of the participants. The full list is served by the paginated participants endpoint.
+        """
+        preview = getattr(obj, 'participants_preview', None)
+        if preview is None:
+            preview = obj.participants.order_by('pk')[:PARTICIPANTS_PREVIEW_SIZE]
+        else:
+            preview = [User(**participant) for participant in preview]
+
+        return FriendSerializer(preview, many=True, context=self.context).data
+
+    def get_participants_count(self, obj):
+        participants_count = getattr(obj, 'participants_count', None)
+        if participants_count is None:
+            return obj.participants.count()
+
+        return participants_count
+
     def get_distance(self, obj):
+        if getattr(obj, 'distance', None) is not None:
+            return floor(obj.distance.m)
+
         point = self.context['request'].headers.get('Point')
         if point is None:
             return 0
@@ -69,7 +116,7 @@ class PartySerializer(serializers.ModelSerializer):
         return floor(distance(obj.location, point_location).meters)
 
 
-class PartyInvitationSerializer(serializers.ModelSerializer):
+class PartyInvitationSerializer(UniqueCreateMixin, serializers.ModelSerializer):
     party = PartySerializer(read_only=True)
     party_public_id = serializers.SlugRelatedField(
         source='party', queryset=Party.objects.all(), slug_field='public_id', write_only=True
@@ -85,13 +132,24 @@ class PartyInvitationSerializer(serializers.ModelSerializer):
         fields = ['id', 'party', 'party_public_id', 'receiver', 'receiver_public_id', 'created_at']
 
     def validate(self, attrs):
-        if attrs['receiver'] in attrs['party'].participants.all():
+        if attrs['party'].participants.filter(pk=attrs['receiver'].pk).exists():
             raise serializers.ValidationError(_('User is already party participant. '))
 
         return attrs
 
 
-class PartyRequestSerializer(serializers.ModelSerializer):
+class PartyInvitationBulkSerializer(serializers.Serializer):
+    receiver_public_ids = serializers.ListField(child=serializers.UUIDField(), required=False, max_length=100)
+    all_friends = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if not attrs['all_friends'] and not attrs.get('receiver_public_ids'):
+            raise serializers.ValidationError(_('Provide a list of receivers or invite all friends. '))
+
+        return attrs
+
+
+class PartyRequestSerializer(UniqueCreateMixin, serializers.ModelSerializer):
     party = PartySerializer(read_only=True)
     party_public_id = serializers.SlugRelatedField(
         source='party', queryset=Party.objects.all(), slug_field='public_id', write_only=True
@@ -106,8 +164,25 @@ class PartyRequestSerializer(serializers.ModelSerializer):
         model = PartyRequest
         fields = ['id', 'party', 'party_public_id', 'sender', 'sender_public_id', 'created_at']
 
+    unique_error_message = gettext_lazy('Request like this already exists. ')
+
     def validate(self, attrs):
-        if attrs['sender'] in attrs['party'].participants.all():
+        if attrs['party'].participants.filter(pk=attrs['sender'].pk).exists():
             raise serializers.ValidationError(_('User is already party participant. '))
 
         return attrs
+
+
+class PartyRequestBatchSerializer(serializers.Serializer):
+    ACCEPT = 'accept'
+    REJECT = 'reject'
+
+    action = serializers.ChoiceField(choices=[ACCEPT, REJECT])
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, max_length=1000)
+    all = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if not attrs['all'] and not attrs.get('ids'):
+            raise serializers.ValidationError(_('Provide a list of request ids or select all requests. '))
+
+        return attrs
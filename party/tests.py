@@ -1,6 +1,10 @@
 import datetime
 
 from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import GEOSGeometry
+from django.contrib.gis.measure import D
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -57,9 +61,9 @@ class PartyTest(APITestCase):
                                              description='private_party description',
                                              privacy_status=Party.PrivacyStatus.PRIVATE,
                                              location='POINT(12 12)',
-                                             start_time=timezone.datetime(day=1, month=1, year=1, hour=22, minute=10,
+                                             start_time=timezone.datetime(day=1, month=1, year=2100, hour=22, minute=10,
                                                                           tzinfo=timezone.utc),
-                                             stop_time=timezone.datetime(day=2, month=1, year=1, hour=4, minute=0,
+                                             stop_time=timezone.datetime(day=2, month=1, year=2100, hour=4, minute=0,
                                                                          tzinfo=timezone.utc))
 
         public_party = Party.objects.create(name='public_party name',
@@ -67,9 +71,9 @@ class PartyTest(APITestCase):
                                             description='public_party description',
                                             privacy_status=Party.PrivacyStatus.PUBLIC,
                                             location='POINT(12 12)',
-                                            start_time=timezone.datetime(day=1, month=1, year=1, hour=22, minute=10,
+                                            start_time=timezone.datetime(day=1, month=1, year=2100, hour=22, minute=10,
                                                                          tzinfo=timezone.utc),
-                                            stop_time=timezone.datetime(day=2, month=1, year=1, hour=4, minute=0,
+                                            stop_time=timezone.datetime(day=2, month=1, year=2100, hour=4, minute=0,
                                                                         tzinfo=timezone.utc))
 
         secret_party = Party.objects.create(name='secret_party name',
@@ -77,9 +81,9 @@ class PartyTest(APITestCase):
                                             description='secret_party description',
                                             privacy_status=Party.PrivacyStatus.SECRET,
                                             location='POINT(12 12)',
-                                            start_time=timezone.datetime(day=1, month=1, year=1, hour=22, minute=10,
+                                            start_time=timezone.datetime(day=1, month=1, year=2100, hour=22, minute=10,
                                                                          tzinfo=timezone.utc),
-                                            stop_time=timezone.datetime(day=2, month=1, year=1, hour=4, minute=0,
+                                            stop_time=timezone.datetime(day=2, month=1, year=2100, hour=4, minute=0,
                                                                         tzinfo=timezone.utc))
 
         data = {'email': user.email, 'password': 'Password&1976'}
@@ -106,6 +110,288 @@ class PartyTest(APITestCase):
         response = self.client.get(f'{self.URL}mine/', format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
         self.assertEqual(len(response.data['results']), 0)
 
+    def test_list_visible_parties(self):
+        user = User.objects.create_user(email='user@user.com',
+                                        username='username',
+                                        password='Password&1976',
+                                        date_of_birth=datetime.date(2000, 1, 1))
+
+        party_user = User.objects.create_user(email='party_user@party_user.com',
+                                              username='party_username',
+                                              password='Password&1976',
+                                              date_of_birth=datetime.date(2000, 1, 1))
+
+        secret_party = Party.objects.create(name='secret_party name',
+                                            owner=party_user,
+                                            description='secret_party description',
+                                            privacy_status=Party.PrivacyStatus.SECRET,
+                                            location='POINT(12 12)',
+                                            start_time=timezone.datetime(day=1, month=1, year=1, hour=22, minute=10,
+                                                                         tzinfo=timezone.utc),
+                                            stop_time=timezone.datetime(day=2, month=1, year=1, hour=4, minute=0,
+                                                                        tzinfo=timezone.utc))
+
+        self.assertFalse(Party.objects.visible_to(user).exists())
+        self.assertTrue(Party.objects.visible_to(party_user).exists())
+
+        secret_party.participants.add(user)
+
+        self.assertEqual(list(Party.objects.visible_to(user)), [secret_party])
+
+        user.friends_list.add_friend(party_user)
+        Party.objects.create(name='private_party name',
+                             owner=party_user,
+                             description='private_party description',
+                             privacy_status=Party.PrivacyStatus.PRIVATE,
+                             location='POINT(12 12)',
+                             start_time=timezone.datetime(day=1, month=1, year=1, hour=22, minute=10,
+                                                          tzinfo=timezone.utc),
+                             stop_time=timezone.datetime(day=2, month=1, year=1, hour=4, minute=0,
+                                                         tzinfo=timezone.utc))
+
+        self.assertEqual(Party.objects.visible_to(user).count(), 2)
+
+    def test_list_participant_parties(self):
+        user = User.objects.create_user(email='user@user.com',
+                                        username='username',
+                                        password='Password&1976',
+                                        date_of_birth=datetime.date(2000, 1, 1))
+
+        party_user = User.objects.create_user(email='party_user@party_user.com',
+                                              username='party_username',
+                                              password='Password&1976',
+                                              date_of_birth=datetime.date(2000, 1, 1))
+
+        party = Party.objects.create(name='public_party name',
+                                     owner=party_user,
+                                     description='public_party description',
+                                     privacy_status=Party.PrivacyStatus.PUBLIC,
+                                     location='POINT(12 12)',
+                                     start_time=timezone.datetime(day=1, month=1, year=1, hour=22, minute=10,
+                                                                  tzinfo=timezone.utc),
+                                     stop_time=timezone.datetime(day=2, month=1, year=1, hour=4, minute=0,
+                                                                 tzinfo=timezone.utc))
+
+        Party.objects.create(name='other_party name',
+                             owner=party_user,
+                             description='other_party description',
+                             privacy_status=Party.PrivacyStatus.PUBLIC,
+                             location='POINT(12 12)',
+                             start_time=timezone.datetime(day=1, month=1, year=1, hour=22, minute=10,
+                                                          tzinfo=timezone.utc),
+                             stop_time=timezone.datetime(day=2, month=1, year=1, hour=4, minute=0,
+                                                         tzinfo=timezone.utc))
+
+        party.participants.add(user, party_user)
+
+        data = {'email': user.email, 'password': 'Password&1976'}
+        jwt = self.client.post('/auth/token/', data, format='json').data['access']
+
+        response = self.client.get(f'{self.URL}participant/', format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['public_id'], str(party.public_id))
+
+    def test_list_party_participants(self):
+        user = User.objects.create_user(email='user@user.com',
+                                        username='username',
+                                        password='Password&1976',
+                                        date_of_birth=datetime.date(2000, 1, 1))
+
+        party = Party.objects.create(name='public_party name',
+                                     owner=user,
+                                     description='public_party description',
+                                     privacy_status=Party.PrivacyStatus.PUBLIC,
+                                     location='POINT(12 12)',
+                                     start_time=timezone.datetime(day=1, month=1, year=1, hour=22, minute=10,
+                                                                  tzinfo=timezone.utc),
+                                     stop_time=timezone.datetime(day=2, month=1, year=1, hour=4, minute=0,
+                                                                 tzinfo=timezone.utc))
+
+        for i in range(15):
+            participant = User.objects.create_user(email=f'participant{i}@participant.com',
+                                                   username=f'participant{i}',
+                                                   password='Password&1976',
+                                                   date_of_birth=datetime.date(2000, 1, 1))
+            party.participants.add(participant)
+
+        data = {'email': user.email, 'password': 'Password&1976'}
+        jwt = self.client.post('/auth/token/', data, format='json').data['access']
+
+        response = self.client.get(f'{self.URL}{party.public_id}/', format='json',
+                                   HTTP_AUTHORIZATION=f'Bearer {jwt}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['participants_count'], 15)
+        self.assertEqual(len(response.data['participants']), 10)
+
+        response = self.client.get(f'{self.URL}{party.public_id}/participants/', format='json',
+                                   HTTP_AUTHORIZATION=f'Bearer {jwt}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 15)
+        self.assertIsNone(response.data['next'])
+
+    def test_list_parties_ordered_by_distance(self):
+        user = User.objects.create_user(email='user@user.com',
+                                        username='username',
+                                        password='Password&1976',
+                                        date_of_birth=datetime.date(2000, 1, 1))
+
+        far_party = Party.objects.create(name='far_party name',
+                                         owner=user,
+                                         description='far_party description',
+                                         privacy_status=Party.PrivacyStatus.PUBLIC,
+                                         location='POINT(12 12)',
+                                         start_time=timezone.datetime(day=1, month=1, year=2100, hour=22, minute=10,
+                                                                      tzinfo=timezone.utc),
+                                         stop_time=timezone.datetime(day=2, month=1, year=2100, hour=4, minute=0,
+                                                                     tzinfo=timezone.utc))
+
+        near_party = Party.objects.create(name='near_party name',
+                                          owner=user,
+                                          description='near_party description',
+                                          privacy_status=Party.PrivacyStatus.PUBLIC,
+                                          location='POINT(10 10.01)',
+                                          start_time=timezone.datetime(day=1, month=1, year=2100, hour=22, minute=10,
+                                                                       tzinfo=timezone.utc),
+                                          stop_time=timezone.datetime(day=2, month=1, year=2100, hour=4, minute=0,
+                                                                      tzinfo=timezone.utc))
+
+        data = {'email': user.email, 'password': 'Password&1976'}
+        jwt = self.client.post('/auth/token/', data, format='json').data['access']
+
+        response = self.client.get(f'{self.URL}?ordering=distance', format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(f'{self.URL}?ordering=distance', format='json',
+                                   HTTP_AUTHORIZATION=f'Bearer {jwt}', HTTP_POINT='POINT(10 10)')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['public_id'], str(near_party.public_id))
+        self.assertEqual(response.data['results'][1]['public_id'], str(far_party.public_id))
+        self.assertAlmostEqual(response.data['results'][0]['distance'], 1106, delta=5)
+
+    def test_list_parties_in_range(self):
+        user = User.objects.create_user(email='user@user.com',
+                                        username='username',
+                                        password='Password&1976',
+                                        date_of_birth=datetime.date(2000, 1, 1))
+
+        near_party = Party.objects.create(name='near_party name',
+                                          owner=user,
+                                          description='near_party description',
+                                          privacy_status=Party.PrivacyStatus.PUBLIC,
+                                          location='POINT(10 10.01)',
+                                          start_time=timezone.datetime(day=1, month=1, year=2100, hour=22, minute=10,
+                                                                       tzinfo=timezone.utc),
+                                          stop_time=timezone.datetime(day=2, month=1, year=2100, hour=4, minute=0,
+                                                                      tzinfo=timezone.utc))
+
+        Party.objects.create(name='far_party name',
+                             owner=user,
+                             description='far_party description',
+                             privacy_status=Party.PrivacyStatus.PUBLIC,
+                             location='POINT(12 12)',
+                             start_time=timezone.datetime(day=1, month=1, year=2100, hour=22, minute=10,
+                                                          tzinfo=timezone.utc),
+                             stop_time=timezone.datetime(day=2, month=1, year=2100, hour=4, minute=0,
+                                                         tzinfo=timezone.utc))
+
+        data = {'email': user.email, 'password': 'Password&1976'}
+        jwt = self.client.post('/auth/token/', data, format='json').data['access']
+
+        response = self.client.get(f'{self.URL}?range=2000', format='json',
+                                   HTTP_AUTHORIZATION=f'Bearer {jwt}', HTTP_POINT='POINT(10 10)')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['public_id'], str(near_party.public_id))
+
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+        queryset = Party.objects.filter(
+            location_geography__dwithin=(GEOSGeometry('POINT(10 10)', srid=4326), D(m=2000))
+        )
+        plan = queryset.explain()
+        self.assertIn('Index', plan)
+        self.assertIn('location_geography', plan)
+
+    def test_list_nearest_parties(self):
+        user = User.objects.create_user(email='user@user.com',
+                                        username='username',
+                                        password='Password&1976',
+                                        date_of_birth=datetime.date(2000, 1, 1))
+
+        parties = []
+        for i, location in enumerate(['POINT(10 10.03)', 'POINT(10 10.01)', 'POINT(10 10.02)']):
+            parties.append(Party.objects.create(name=f'party name {i}',
+                                                owner=user,
+                                                description='party description',
+                                                privacy_status=Party.PrivacyStatus.PUBLIC,
+                                                location=location,
+                                                start_time=timezone.datetime(day=1, month=1, year=2100, hour=22,
+                                                                             minute=10, tzinfo=timezone.utc),
+                                                stop_time=timezone.datetime(day=2, month=1, year=2100, hour=4, minute=0,
+                                                                            tzinfo=timezone.utc)))
+
+        data = {'email': user.email, 'password': 'Password&1976'}
+        jwt = self.client.post('/auth/token/', data, format='json').data['access']
+
+        response = self.client.get(f'{self.URL}nearest/', format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(f'{self.URL}nearest/?k=2', format='json',
+                                   HTTP_AUTHORIZATION=f'Bearer {jwt}', HTTP_POINT='POINT(10 10)')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([party['public_id'] for party in response.data['results']],
+                         [str(parties[1].public_id), str(parties[2].public_id)])
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get(response.data['next'], format='json',
+                                   HTTP_AUTHORIZATION=f'Bearer {jwt}', HTTP_POINT='POINT(10 10)')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([party['public_id'] for party in response.data['results']], [str(parties[0].public_id)])
+        self.assertIsNone(response.data['next'])
+
+    def test_list_parties_by_time_window(self):
+        user = User.objects.create_user(email='user@user.com',
+                                        username='username',
+                                        password='Password&1976',
+                                        date_of_birth=datetime.date(2000, 1, 1))
+
+        now = timezone.now()
+        time_windows = {'past': (now - datetime.timedelta(days=2), now - datetime.timedelta(days=1)),
+                        'ongoing': (now - datetime.timedelta(hours=1), now + datetime.timedelta(hours=1)),
+                        'upcoming': (now + datetime.timedelta(days=1), now + datetime.timedelta(days=2))}
+
+        parties = {}
+        for when, (start_time, stop_time) in time_windows.items():
+            parties[when] = Party.objects.create(name=f'{when}_party name',
+                                                 owner=user,
+                                                 description=f'{when}_party description',
+                                                 privacy_status=Party.PrivacyStatus.PUBLIC,
+                                                 location='POINT(12 12)',
+                                                 start_time=start_time,
+                                                 stop_time=stop_time)
+
+        data = {'email': user.email, 'password': 'Password&1976'}
+        jwt = self.client.post('/auth/token/', data, format='json').data['access']
+
+        response = self.client.get(self.URL, format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+
+        for when, party in parties.items():
+            response = self.client.get(f'{self.URL}?when={when}', format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['results']), 1)
+            self.assertEqual(response.data['results'][0]['public_id'], str(party.public_id))
+
+        response = self.client.get(self.URL, {'start_after': now.isoformat()}, HTTP_AUTHORIZATION=f'Bearer {jwt}')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['public_id'], str(parties['upcoming'].public_id))
+
+        response = self.client.get(f'{self.URL}?when=tomorrow', format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_retrieve_party(self):
         user = User.objects.create_user(email='user@user.com',
                                         username='username',
@@ -299,6 +585,54 @@ class PartyInvitationTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(PartyInvitation.objects.count(), 1)
 
+        response = self.client.post(f'{self.URL}{private_party.public_id}/',
+                                    data, format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(PartyInvitation.objects.count(), 1)
+
+    def test_send_bulk_invitations(self):
+        party_user = User.objects.create_user(email='party_user@party_user.com',
+                                              username='party_username',
+                                              password='Password&1976',
+                                              date_of_birth=datetime.date(2000, 1, 1))
+
+        users = [User.objects.create_user(email=f'user{i}@user.com',
+                                          username=f'username{i}',
+                                          password='Password&1976',
+                                          date_of_birth=datetime.date(2000, 1, 1)) for i in range(4)]
+
+        private_party = Party.objects.create(name='private_party name',
+                                             owner=party_user,
+                                             description='private_party description',
+                                             privacy_status=Party.PrivacyStatus.PRIVATE,
+                                             location='POINT(12 12)',
+                                             start_time=timezone.datetime(day=1, month=1, year=1, hour=22, minute=10,
+                                                                          tzinfo=timezone.utc),
+                                             stop_time=timezone.datetime(day=2, month=1, year=1, hour=4, minute=0,
+                                                                         tzinfo=timezone.utc))
+
+        private_party.participants.add(users[0])
+        PartyInvitation.objects.create(party=private_party, receiver=users[1])
+        for user in users:
+            party_user.friends_list.add_friend(user)
+
+        data = {'email': party_user.email, 'password': 'Password&1976'}
+        jwt = self.client.post('/auth/token/', data, format='json').data['access']
+
+        data = {'receiver_public_ids': [str(user.public_id) for user in users[:3]]}
+
+        response = self.client.post(f'{self.URL}{private_party.public_id}/',
+                                    data, format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['invited'], [users[2].public_id])
+        self.assertEqual(response.data['skipped'], [users[0].public_id, users[1].public_id])
+
+        response = self.client.post(f'{self.URL}{private_party.public_id}/',
+                                    {'all_friends': True}, format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['invited'], [users[3].public_id])
+        self.assertEqual(PartyInvitation.objects.filter(party=private_party).count(), 3)
+
     def test_list_invitations(self):
         user = User.objects.create_user(email='user@user.com',
                                         username='username',
@@ -329,6 +663,41 @@ class PartyInvitationTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
 
+    def test_list_invitations_query_count(self):
+        user = User.objects.create_user(email='user@user.com',
+                                        username='username',
+                                        password='Password&1976',
+                                        date_of_birth=datetime.date(2000, 1, 1))
+
+        party_user = User.objects.create_user(email='party_user@party_user.com',
+                                              username='party_username',
+                                              password='Password&1976',
+                                              date_of_birth=datetime.date(2000, 1, 1))
+
+        data = {'email': user.email, 'password': 'Password&1976'}
+        jwt = self.client.post('/auth/token/', data, format='json').data['access']
+
+        query_counts = []
+        for i in range(2):
+            party = Party.objects.create(name=f'party name {i}',
+                                         owner=party_user,
+                                         description='party description',
+                                         privacy_status=Party.PrivacyStatus.PRIVATE,
+                                         location='POINT(12 12)',
+                                         start_time=timezone.datetime(day=1, month=1, year=1, hour=22, minute=10,
+                                                                      tzinfo=timezone.utc),
+                                         stop_time=timezone.datetime(day=2, month=1, year=1, hour=4, minute=0,
+                                                                     tzinfo=timezone.utc))
+            party.participants.add(party_user)
+            PartyInvitation.objects.create(party=party, receiver=user)
+
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(self.URL, HTTP_AUTHORIZATION=f'Bearer {jwt}')
+            self.assertEqual(len(response.data['results']), i + 1)
+            query_counts.append(len(context.captured_queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
     def test_list_party_invitations(self):
         user = User.objects.create_user(email='user@user.com',
                                         username='username',
@@ -398,6 +767,9 @@ class PartyInvitationTest(APITestCase):
         self.assertEqual(PartyInvitation.objects.count(), 0)
         self.assertTrue(user in private_party.participants.all())
 
+        self.assertFalse(party_invitation.accept())
+        self.assertEqual(private_party.participants.count(), 1)
+
     def test_decline_invitation(self):
         user = User.objects.create_user(email='user@user.com',
                                         username='username',
@@ -513,6 +885,11 @@ class PartyRequestTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(PartyRequest.objects.count(), 1)
 
+        response = self.client.post(f'{self.URL}{public_party.public_id}/',
+                                    format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(PartyRequest.objects.count(), 1)
+
     def test_list_requests(self):
         user = User.objects.create_user(email='user@user.com',
                                         username='username',
@@ -612,6 +989,57 @@ class PartyRequestTest(APITestCase):
         self.assertEqual(PartyInvitation.objects.count(), 0)
         self.assertTrue(user in private_party.participants.all())
 
+        self.assertFalse(party_request.accept())
+        self.assertEqual(private_party.participants.count(), 1)
+
+    def test_batch_requests(self):
+        party_user = User.objects.create_user(email='party_user@party_user.com',
+                                              username='party_username',
+                                              password='Password&1976',
+                                              date_of_birth=datetime.date(2000, 1, 1))
+
+        users = [User.objects.create_user(email=f'user{i}@user.com',
+                                          username=f'username{i}',
+                                          password='Password&1976',
+                                          date_of_birth=datetime.date(2000, 1, 1)) for i in range(4)]
+
+        public_party = Party.objects.create(name='public_party name',
+                                            owner=party_user,
+                                            description='public_party description',
+                                            privacy_status=Party.PrivacyStatus.PUBLIC,
+                                            location='POINT(12 12)',
+                                            start_time=timezone.datetime(day=1, month=1, year=1, hour=22, minute=10,
+                                                                         tzinfo=timezone.utc),
+                                            stop_time=timezone.datetime(day=2, month=1, year=1, hour=4, minute=0,
+                                                                        tzinfo=timezone.utc))
+
+        party_requests = [PartyRequest.objects.create(party=public_party, sender=user) for user in users]
+
+        data = {'email': users[0].email, 'password': 'Password&1976'}
+        jwt = self.client.post('/auth/token/', data, format='json').data['access']
+
+        data = {'action': 'accept', 'all': True}
+        response = self.client.post(f'{self.URL}{public_party.public_id}/batch/',
+                                    data, format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        data = {'email': party_user.email, 'password': 'Password&1976'}
+        jwt = self.client.post('/auth/token/', data, format='json').data['access']
+
+        data = {'action': 'accept', 'ids': [party_request.pk for party_request in party_requests[:2]]}
+        response = self.client.post(f'{self.URL}{public_party.public_id}/batch/',
+                                    data, format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(response.data['ids']), [party_request.pk for party_request in party_requests[:2]])
+        self.assertEqual(set(public_party.participants.all()), set(users[:2]))
+
+        data = {'action': 'reject', 'all': True}
+        response = self.client.post(f'{self.URL}{public_party.public_id}/batch/',
+                                    data, format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(PartyRequest.objects.count(), 0)
+        self.assertEqual(public_party.participants.count(), 2)
+
     def test_decline_request(self):
         user = User.objects.create_user(email='user@user.com',
                                         username='username',
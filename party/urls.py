@@ -7,10 +7,12 @@ urlpatterns = [
                                    'post': 'create'})),
     path('mine/', PartyViewSet.as_view({'get': 'list_mine'})),
     path('participant/', PartyViewSet.as_view({'get': 'list_participant'})),
+    path('nearest/', PartyViewSet.as_view({'get': 'list_nearest'})),
     path('<uuid:public_id>/', PartyViewSet.as_view({'get': 'retrieve',
                                                     'put': 'update',
                                                     'patch': 'partial_update',
                                                     'delete': 'destroy'})),
+    path('<uuid:public_id>/participants/', PartyViewSet.as_view({'get': 'participants'})),
 
     path('invitations/', PartyInvitationViewSet.as_view({'get': 'list_mine'})),
     path('invitations/<uuid:party_public_id>/', PartyInvitationViewSet.as_view({'get': 'list',
@@ -21,6 +23,7 @@ urlpatterns = [
     path('requests/', PartyRequestViewSet.as_view({'get': 'list_mine'})),
     path('requests/<uuid:party_public_id>/', PartyRequestViewSet.as_view({'get': 'list',
                                                                           'post': 'create'})),
+    path('requests/<uuid:party_public_id>/batch/', PartyRequestViewSet.as_view({'post': 'batch'})),
     path('requests/<uuid:party_public_id>/<int:pk>/',
          PartyRequestViewSet.as_view({'get': 'list', 'post': 'accept', 'delete': 'destroy'}))
 ]
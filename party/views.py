@@ -1,6 +1,10 @@
 from django.contrib.auth import get_user_model
 from django.contrib.gis.geos import GEOSGeometry
-from django.contrib.gis.measure import Distance
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.measure import D
+from django.db.models import Prefetch
+from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status, filters
 from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
@@ -8,7 +12,13 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 
-from .serializers import PartySerializer, PartyInvitationSerializer, PartyRequestSerializer
+from LiquorLovers.pagination import KeysetPagination
+from friend.models import Friendship
+from friend.serializers import FriendSerializer
+from .filters import PartyFilter
+from .pagination import NearestKeysetPagination
+from .serializers import PartySerializer, PartyInvitationSerializer, PartyInvitationBulkSerializer, \
+    PartyRequestSerializer, PartyRequestBatchSerializer
 from .models import Party, PartyInvitation, PartyRequest
 
 User = get_user_model()
@@ -16,11 +26,14 @@ User = get_user_model()
 
 class PartyViewSet(viewsets.ModelViewSet):
     lookup_field = 'public_id'
-    queryset = Party.objects.all().order_by('id')
+    queryset = Party.objects.with_related().order_by('id')
     serializer_class = PartySerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [filters.SearchFilter]
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filterset_class = PartyFilter
     search_fields = ['username', 'first_name', 'last_name']
+    ordering_fields = ['distance', 'id']
 
     def create(self, request, *args, **kwargs):
         """
@@ -45,7 +58,7 @@ class PartyViewSet(viewsets.ModelViewSet):
         """
         Lists all the parties that a user can see.
         """
-        queryset = list(filter(lambda p: p.can_see_party(request.user), self.filter_queryset(self.get_queryset())))
+        queryset = self.filter_queryset(self.get_queryset().visible_to(request.user))
 
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -60,7 +73,7 @@ class PartyViewSet(viewsets.ModelViewSet):
         """
         Lists all the parties that a user is a participant of.
         """
-        queryset = list(filter(lambda p: request.user in p.participants.all(), self.filter_queryset(self.get_queryset())))
+        queryset = self.filter_queryset(self.get_queryset().filter(participants=request.user))
 
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -70,12 +83,28 @@ class PartyViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    @action(methods=['GET'], detail=False)
+    def list_nearest(self, request, *args, **kwargs):
+        """
+        Lists the parties closest to the `Point` header that a user can see, nearest first.
+        """
+        point = self.get_point()
+        if point is None:
+            raise ValidationError({"msg": "Point header is missing."})
+
+        queryset = self.filter_queryset(self.get_queryset().visible_to(request.user)).nearest_to(point)
+
+        paginator = NearestKeysetPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
     @action(methods=['GET'], detail=False)
     def list_mine(self, request, *args, **kwargs):
         """
         Lists all the parties that the user is owner of.
         """
-        queryset = self.filter_queryset(request.user.parties_where_im_owner.all())
+        queryset = self.filter_queryset(self.get_queryset().filter(owner=request.user))
 
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -85,6 +114,21 @@ class PartyViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    @action(methods=['GET'], detail=True)
+    def participants(self, request, *args, **kwargs):
+        """
+        Lists all the participants of a party using cursor pagination.
+        """
+        party = self.get_object()
+
+        if not party.can_see_party(request.user):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(party.participants.all(), request, view=self)
+        serializer = FriendSerializer(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
+
     def update(self, request, *args, **kwargs):
         """
         Updates a party. Returns a 403 Forbidden error if the request user is not the owner of the party.
@@ -128,25 +172,45 @@ class PartyViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def filter_queryset(self, queryset):
+        if self.action in ('list', 'list_nearest') and 'when' not in self.request.query_params:
+            queryset = queryset.filter(stop_time__gt=timezone.now())
+
+        point = self.get_point()
+        if point is not None:
+            queryset = queryset.annotate(distance=Distance('location', point, spheroid=True))
+        elif 'distance' in self.request.query_params.get('ordering', ''):
+            raise ValidationError({"msg": "Point header is missing."})
+
         party_range = self.request.query_params.get('range')
         if party_range is not None:
-            point = self.request.headers.get('Point')
             if point is None:
                 raise ValidationError({"msg": "Point header is missing."})
 
-            location = GEOSGeometry(point)
             queryset = queryset.filter(
-                location__distance_lt=(location, Distance(m=party_range))
+                location_geography__dwithin=(point, D(m=party_range))
             )
 
         return super().filter_queryset(queryset)
 
+    def get_point(self):
+        """
+        Parses the `Point` header of the request once per request. Points without SRID are assumed to be WGS 84.
+        """
+        if not hasattr(self, '_point'):
+            point = self.request.headers.get('Point')
+            self._point = GEOSGeometry(point, srid=4326) if point is not None else None
+
+        return self._point
+
 
 class PartyInvitationViewSet(viewsets.ModelViewSet):
     lookup_field = 'pk'
-    queryset = PartyInvitation.objects.all()
+    queryset = PartyInvitation.objects.select_related('receiver') \
+        .prefetch_related(Prefetch('party', queryset=Party.objects.with_related())) \
+        .order_by('id')
     serializer_class = PartyInvitationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def create(self, request, *args, **kwargs):
         """
@@ -157,11 +221,37 @@ class PartyInvitationViewSet(viewsets.ModelViewSet):
         if request.user != party.owner:
             return Response(status=status.HTTP_403_FORBIDDEN)
 
+        if 'receiver_public_ids' in request.data or 'all_friends' in request.data:
+            return self.bulk_create(request, party)
+
         serializer = self.get_serializer(data=request.data | {'party_public_id': party.public_id})
         serializer.is_valid(raise_exception=True)
         self.perform_create(serializer)
         return Response(status=status.HTTP_201_CREATED)
 
+    def bulk_create(self, request, party):
+        """
+        Handles creation of party invitations for a list of users or for all friends of the party owner.
+        Users who already participate or are already invited are reported as skipped.
+        """
+        serializer = PartyInvitationBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        if serializer.validated_data['all_friends']:
+            users = Friendship.objects.friends_of(party.owner)
+        else:
+            users = User.objects.filter(public_id__in=serializer.validated_data['receiver_public_ids'])
+
+        invited = PartyInvitation.objects.bulk_invite(party, users)
+
+        data = {'invited': invited}
+        if not serializer.validated_data['all_friends']:
+            invited_public_ids = set(invited)
+            receiver_public_ids = dict.fromkeys(serializer.validated_data['receiver_public_ids'])
+            data['skipped'] = [public_id for public_id in receiver_public_ids if public_id not in invited_public_ids]
+
+        return Response(data, status=status.HTTP_201_CREATED)
+
     @action(detail=True, methods=['POST'])
     def accept(self, request, *args, **kwargs):
         """
@@ -229,9 +319,12 @@ class PartyInvitationViewSet(viewsets.ModelViewSet):
 
 class PartyRequestViewSet(viewsets.ModelViewSet):
     lookup_field = 'pk'
-    queryset = PartyRequest.objects.all()
+    queryset = PartyRequest.objects.select_related('sender') \
+        .prefetch_related(Prefetch('party', queryset=Party.objects.with_related())) \
+        .order_by('id')
     serializer_class = PartyRequestSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def create(self, request, *args, **kwargs):
         """
@@ -262,6 +355,30 @@ class PartyRequestViewSet(viewsets.ModelViewSet):
         party_request.accept()
         return Response(status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=['POST'])
+    def batch(self, request, *args, **kwargs):
+        """
+        Handles the acceptance or rejection of many party requests at once.
+        """
+        party = self.get_party()
+
+        if request.user != party.owner:
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+        serializer = PartyRequestBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        requests = PartyRequest.objects.all()
+        if not serializer.validated_data['all']:
+            requests = requests.filter(pk__in=serializer.validated_data['ids'])
+
+        if serializer.validated_data['action'] == PartyRequestBatchSerializer.ACCEPT:
+            request_ids = PartyRequest.objects.accept_batch(party, requests)
+        else:
+            request_ids = PartyRequest.objects.reject_batch(party, requests)
+
+        return Response({'ids': request_ids})
+
     def list(self, request, *args, **kwargs):
         """
         Retrieves the list of party requests for the party.
@@ -1,6 +1,11 @@
 from django.apps import AppConfig
 
+from LiquorLovers.storage import track_files
+
 
 class UserConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'user'
+
+    def ready(self):
+        track_files(self.get_model('User'), 'pfp')
@@ -0,0 +1,43 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from LiquorLovers.images import ImageStatus, fit_within, process_image, square
+from party.models import Party
+from party.serializers import PartySerializer
+from user.serializers import UserSerializer
+
+User = get_user_model()
+
+IMAGE_JOBS = [
+    (User, 'pfp', 'pfp_status', square(UserSerializer.PFP_SIZE)),
+    (Party, 'image', 'image_status', fit_within(PartySerializer.IMAGE_SIZE)),
+]
+
+
+class Command(BaseCommand):
+    help = 'Processes again the images left in processing, e.g. by jobs lost in a restart of the server.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=10,
+                            help='Only images uploaded at least this many minutes ago are processed.')
+
+    def handle(self, *args, **options):
+        uploaded_before = timezone.now() - datetime.timedelta(minutes=options['older_than'])
+
+        for model, field_name, status_field_name, processor in IMAGE_JOBS:
+            storage = model._meta.get_field(field_name).storage
+            stale = model.objects.filter(**{status_field_name: ImageStatus.PROCESSING}) \
+                .values_list('pk', field_name)
+
+            processed = 0
+            for pk, name in stale.iterator():
+                if storage.exists(name) and storage.get_modified_time(name) > uploaded_before:
+                    continue
+
+                process_image(model, pk, field_name, status_field_name, name, processor)
+                processed += 1
+
+            self.stdout.write(f'{model._meta.label}.{field_name}: {processed} processed')
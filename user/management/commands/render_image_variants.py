@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from LiquorLovers.images import ImageStatus, render_stored_variants
+from party.models import Party
+
+User = get_user_model()
+
+IMAGE_FIELDS = [(User, 'pfp', 'pfp_status'), (Party, 'image', 'image_status')]
+
+
+class Command(BaseCommand):
+    help = 'Renders the thumbnail variants of the default images, or of every stored image with --all.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Render the variants of uploaded images too.')
+
+    def handle(self, *args, **options):
+        for model, field_name, status_field_name in IMAGE_FIELDS:
+            field = model._meta.get_field(field_name)
+            names = [field.default]
+
+            if options['all']:
+                uploaded = model.objects.exclude(**{field_name: field.default}) \
+                    .filter(**{status_field_name: ImageStatus.READY}) \
+                    .values_list(field_name, flat=True)
+                names += list(uploaded.iterator())
+
+            for name in names:
+                render_stored_variants(field.storage, name)
+                self.stdout.write(name)
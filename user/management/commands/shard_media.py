@@ -0,0 +1,106 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from LiquorLovers.images import VARIANT_FORMATS, VARIANT_SIZES, variant_name
+from LiquorLovers.storage import SHARDED_NAME, TRACKED_FIELDS
+
+
+class Command(BaseCommand):
+    help = 'Moves the stored media files into the sharded content-addressed layout and updates the rows using them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of file names handled per batch.')
+        parser.add_argument('--workers', type=int, default=4, help='Number of threads moving files.')
+
+    def handle(self, *args, **options):
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            for model, field_name in TRACKED_FIELDS:
+                self.shard_field(executor, model, field_name, options['batch_size'], options['workers'])
+
+    def shard_field(self, executor, model, field_name, batch_size, workers):
+        """
+        Walks the distinct file names of the field that are not sharded yet in batches, ordered by name.
+        Each file is linked to its new name before the rows are updated and only unlinked afterwards,
+        so an interrupted run leaves every row pointing at an existing file and can simply be started again.
+        """
+        field = model._meta.get_field(field_name)
+        names = model._default_manager.exclude(**{field_name: field.default}) \
+            .exclude(**{f'{field_name}__regex': SHARDED_NAME.pattern}) \
+            .order_by(field_name) \
+            .values_list(field_name, flat=True) \
+            .distinct()
+
+        moved = missing = 0
+        last_name = None
+
+        while True:
+            batch = names.filter(**{f'{field_name}__gt': last_name}) if last_name is not None else names
+            batch = list(batch[:batch_size])
+            if not batch:
+                break
+
+            if workers > 1:
+                chunks = [batch[i::workers] for i in range(workers)]
+                results = executor.map(self.shard_files_in_thread,
+                                       [model] * workers, [field_name] * workers, chunks)
+            else:
+                results = [self.shard_files(model, field_name, batch)]
+
+            for chunk_moved, chunk_missing in results:
+                moved += chunk_moved
+                missing += chunk_missing
+
+            last_name = batch[-1]
+            self.stdout.write(f'{model._meta.label}.{field_name}: {moved} moved, {missing} missing')
+
+    @classmethod
+    def shard_files_in_thread(cls, model, field_name, names):
+        try:
+            return cls.shard_files(model, field_name, names)
+        finally:
+            connection.close()
+
+    @staticmethod
+    def shard_files(model, field_name, names):
+        storage = model._meta.get_field(field_name).storage
+        moved = missing = 0
+
+        for name in names:
+            if not storage.exists(name):
+                missing += 1
+                continue
+
+            content_hash = hashlib.sha256()
+            with storage.open(name, 'rb') as file:
+                for chunk in file.chunks():
+                    content_hash.update(chunk)
+
+            new_name = storage.content_name(name, content_hash.hexdigest())
+            renames = [(name, new_name)] + [
+                (variant_name(name, size, extension), variant_name(new_name, size, extension))
+                for size in VARIANT_SIZES for extension, _format in VARIANT_FORMATS
+            ]
+
+            for old, new in renames:
+                if storage.exists(old) and not storage.exists(new):
+                    os.makedirs(os.path.dirname(storage.path(new)), exist_ok=True)
+                    try:
+                        os.link(storage.path(old), storage.path(new))
+                    except FileExistsError:
+                        # Another thread linked a file with the same content first
+                        pass
+
+            with transaction.atomic():
+                model._default_manager.filter(**{field_name: name}).update(**{field_name: new_name})
+                storage.move_references(name, new_name)
+
+            for old, _new in renames:
+                storage.delete(old)
+
+            moved += 1
+
+        return moved, missing
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.9 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0003_user_username_alter_user_email_alter_user_pfp'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='pfp_status',
+            field=models.CharField(choices=[('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', editable=False, max_length=10),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.1.9 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0004_user_pfp_status'),
+        ('party', '0011_party_image_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('reference_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO user_storedfile (name, reference_count)
+                SELECT files.name, COUNT(*)
+                FROM (
+                    SELECT pfp AS name FROM user_user WHERE pfp <> 'defaults/pfps/default.png'
+                    UNION ALL
+                    SELECT image AS name FROM party_party WHERE image <> 'defaults/parties/default.png'
+                ) files
+                WHERE files.name <> ''
+                GROUP BY files.name;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
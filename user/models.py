@@ -4,6 +4,7 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.validators import UnicodeUsernameValidator
 
+from LiquorLovers.images import ImageStatus
 from LiquorLovers.utils import uuid_upload_to
 from user.managers import CustomUserManager
 
@@ -13,6 +14,8 @@ class User(AbstractUser):
     date_of_birth = models.DateField(blank=False)
     email = models.EmailField(unique=True, editable=False)
     pfp = models.ImageField(upload_to=uuid_upload_to('pfps'), default='defaults/pfps/default.png')
+    pfp_status = models.CharField(max_length=10, choices=ImageStatus.choices, default=ImageStatus.READY,
+                                  editable=False)
     username = models.CharField(null=False,
                                 blank=False,
                                 max_length=150,
@@ -28,8 +31,14 @@ class User(AbstractUser):
     def __str__(self):
         return self.email
 
-    def delete(self, using=None, keep_parents=False):
-        if self.pfp.name != self.pfp.field.default:
-            self.pfp.delete()
 
-        return super().delete(using, keep_parents)
+class StoredFile(models.Model):
+    """
+    Number of rows referring to a file of the content-addressed storage. It is updated in the transaction
+    that stores or releases the file and its row is locked while the file is written or deleted.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    reference_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.name} ({self.reference_count})'
@@ -6,10 +6,12 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.password_validation import validate_password
+from django.db import transaction
 from django.utils.translation import gettext as _
-from PIL import Image
 from rest_framework.validators import UniqueValidator
 
+from LiquorLovers.images import ImageStatus, process_image_later, square
+from LiquorLovers.serializers import ImageVariantsField
 from friend.serializers import FriendSerializer
 
 User = get_user_model()
@@ -17,6 +19,7 @@ User = get_user_model()
 
 class UserSerializer(serializers.ModelSerializer):
     friends = FriendSerializer(many=True, read_only=True, source='friends_list.friends')
+    variants = ImageVariantsField('pfp', 'pfp_status')
 
     class Meta:
         model = User
@@ -27,17 +30,25 @@ class UserSerializer(serializers.ModelSerializer):
                   'last_name',
                   'date_of_birth',
                   'pfp',
+                  'pfp_status',
+                  'variants',
                   'friends',
                   'password']
         extra_kwargs = {'password': {'write_only': True}}
 
+    PFP_SIZE = 1024
+
     def save(self, **kwargs):
-        user = super().save(**kwargs)
+        uploaded = bool(self.validated_data.get('pfp'))
+        if uploaded:
+            kwargs['pfp_status'] = ImageStatus.PROCESSING
+
+        # The file reference taken by the storage is committed together with the row
+        with transaction.atomic():
+            user = super().save(**kwargs)
 
-        if user.pfp.name != user.pfp.field.default:
-            image = Image.open(user.pfp)
-            resized_image = image.resize((256, 256), Image.ANTIALIAS)
-            resized_image.save(user.pfp.path)
+        if uploaded:
+            process_image_later(user, 'pfp', 'pfp_status', square(self.PFP_SIZE))
 
         return user
 
@@ -74,6 +85,8 @@ class CreateUserSerializer(UserSerializer):
                   'last_name',
                   'date_of_birth',
                   'pfp',
+                  'pfp_status',
+                  'variants',
                   'friends',
                   'password']
         extra_kwargs = {
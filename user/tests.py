@@ -1,13 +1,32 @@
 import datetime
+import io
+import os
+import shutil
+import tempfile
 
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from PIL import Image
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from user.models import StoredFile
 
 User = get_user_model()
 
 
 class UserTests(APITestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.media_settings = override_settings(MEDIA_ROOT=self.media_root)
+        self.media_settings.enable()
+
+    def tearDown(self):
+        self.media_settings.disable()
+        shutil.rmtree(self.media_root)
+
     def test_create_user(self):
         url = '/users/'
 
@@ -94,6 +113,42 @@ class UserTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(User.objects.get(email='email@email.com').date_of_birth, datetime.date(2001, 1, 1))
 
+    @override_settings(IMAGE_PROCESSING_WORKERS=0)
+    def test_update_pfp(self):
+        User.objects.create_user(email='email@email.com',
+                                 username='username',
+                                 password='Password1234$!',
+                                 date_of_birth=datetime.date(2000, 1, 1))
+
+        url = '/users/'
+
+        jwt = self.client.post('/auth/token/',
+                               {'email': 'email@email.com', 'password': 'Password1234$!'},
+                               format='json').data['access']
+
+        image = io.BytesIO()
+        Image.new('RGB', (1024, 768)).save(image, format='JPEG')
+        data = {'pfp': SimpleUploadedFile('pfp.jpg', image.getvalue(), content_type='image/jpeg')}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(url, data, format='multipart', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['pfp_status'], 'processing')
+        self.assertIsNone(response.data['variants'])
+
+        user = User.objects.get(email='email@email.com')
+        self.assertEqual(user.pfp_status, 'ready')
+        self.assertEqual(Image.open(user.pfp.path).size, (768, 768))
+
+        response = self.client.get(url, format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
+
+        self.assertEqual(set(response.data['variants']), {'64', '256', '1024'})
+        self.assertEqual(set(response.data['variants']['64']), {'webp', 'jpg'})
+
+        variant_path = user.pfp.storage.path(response.data['variants']['64']['webp'].split('/media/')[1])
+        self.assertEqual(Image.open(variant_path).size, (64, 64))
+
     def test_retrieve(self):
         user = User.objects.create_user(email='email@email.com',
                                         username='username',
@@ -181,3 +236,145 @@ class UserTests(APITestCase):
         response = self.client.delete(url, format='json', HTTP_AUTHORIZATION=f'Bearer {jwt}')
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(User.objects.count(), 0)
+
+    @override_settings(IMAGE_PROCESSING_WORKERS=0)
+    def test_shared_pfp(self):
+        image = io.BytesIO()
+        Image.new('RGB', (64, 64)).save(image, format='PNG')
+
+        users = []
+        for i in range(2):
+            pfp = SimpleUploadedFile(f'pfp{i}.png', image.getvalue(), content_type='image/png')
+            users.append(User.objects.create_user(email=f'email{i}@email.com',
+                                                  username=f'username{i}',
+                                                  password='Password1234$!',
+                                                  date_of_birth=datetime.date(2000, 1, 1),
+                                                  pfp=pfp))
+
+        self.assertEqual(users[0].pfp.name, users[1].pfp.name)
+        storage, name = users[0].pfp.storage, users[0].pfp.name
+        self.assertEqual(StoredFile.objects.get(name=name).reference_count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            users[0].delete()
+        self.assertTrue(storage.exists(name))
+        self.assertEqual(StoredFile.objects.get(name=name).reference_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            users[1].delete()
+            # The same content uploaded again before the deletion runs keeps the file
+            pfp = SimpleUploadedFile('pfp2.png', image.getvalue(), content_type='image/png')
+            users.append(User.objects.create_user(email='email2@email.com',
+                                                  username='username2',
+                                                  password='Password1234$!',
+                                                  date_of_birth=datetime.date(2000, 1, 1),
+                                                  pfp=pfp))
+        self.assertTrue(storage.exists(name))
+        self.assertEqual(StoredFile.objects.get(name=name).reference_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            users[2].delete()
+        self.assertFalse(storage.exists(name))
+        self.assertFalse(StoredFile.objects.filter(name=name).exists())
+
+    def test_reupload_same_pfp(self):
+        image = io.BytesIO()
+        Image.new('RGB', (64, 64)).save(image, format='PNG')
+
+        user = User.objects.create_user(email='email@email.com',
+                                        username='username',
+                                        password='Password1234$!',
+                                        date_of_birth=datetime.date(2000, 1, 1),
+                                        pfp=SimpleUploadedFile('pfp.png', image.getvalue(), content_type='image/png'))
+        name = user.pfp.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.pfp = SimpleUploadedFile('again.png', image.getvalue(), content_type='image/png')
+            user.save()
+
+        self.assertEqual(user.pfp.name, name)
+        self.assertEqual(StoredFile.objects.get(name=name).reference_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.delete()
+        self.assertFalse(user.pfp.storage.exists(name))
+
+    def test_shard_media(self):
+        user = User.objects.create_user(email='email@email.com',
+                                        username='username',
+                                        password='Password1234$!',
+                                        date_of_birth=datetime.date(2000, 1, 1))
+
+        storage = user.pfp.storage
+        os.makedirs(storage.path('pfps'), exist_ok=True)
+        with open(storage.path('pfps/0f8fad5b-d9cb-469f-a165-70867728950e.jpg'), 'wb') as file:
+            file.write(b'pfp')
+
+        User.objects.filter(pk=user.pk).update(pfp='pfps/0f8fad5b-d9cb-469f-a165-70867728950e.jpg')
+
+        call_command('shard_media', workers=1, stdout=io.StringIO())
+
+        user.refresh_from_db()
+        self.assertTrue(storage.is_sharded(user.pfp.name))
+        self.assertTrue(storage.exists(user.pfp.name))
+        self.assertFalse(storage.exists('pfps/0f8fad5b-d9cb-469f-a165-70867728950e.jpg'))
+
+    def test_process_stale_images(self):
+        image = io.BytesIO()
+        Image.new('RGB', (1024, 768)).save(image, format='JPEG')
+
+        user = User.objects.create_user(email='email@email.com',
+                                        username='username',
+                                        password='Password1234$!',
+                                        date_of_birth=datetime.date(2000, 1, 1),
+                                        pfp=SimpleUploadedFile('pfp.jpg', image.getvalue(), content_type='image/jpeg'),
+                                        pfp_status='processing')
+
+        call_command('process_stale_images', stdout=io.StringIO())
+
+        user.refresh_from_db()
+        self.assertEqual(user.pfp_status, 'processing')
+
+        call_command('process_stale_images', older_than=0, stdout=io.StringIO())
+
+        user.refresh_from_db()
+        self.assertEqual(user.pfp_status, 'ready')
+        self.assertEqual(Image.open(user.pfp.path).size, (768, 768))
+
+
+class ShardMediaTests(APITransactionTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.media_settings = override_settings(MEDIA_ROOT=self.media_root)
+        self.media_settings.enable()
+
+    def tearDown(self):
+        self.media_settings.disable()
+        shutil.rmtree(self.media_root)
+
+    def test_shard_duplicate_media_in_threads(self):
+        names = ['pfps/0f8fad5b-d9cb-469f-a165-70867728950e.jpg', 'pfps/7c9e6679-7425-40de-944b-e07fc1f90ae7.jpg']
+
+        users = []
+        for i, name in enumerate(names):
+            user = User.objects.create_user(email=f'email{i}@email.com',
+                                            username=f'username{i}',
+                                            password='Password1234$!',
+                                            date_of_birth=datetime.date(2000, 1, 1))
+            storage = user.pfp.storage
+            os.makedirs(storage.path('pfps'), exist_ok=True)
+            with open(storage.path(name), 'wb') as file:
+                file.write(b'pfp')
+
+            User.objects.filter(pk=user.pk).update(pfp=name)
+            users.append(user)
+
+        call_command('shard_media', workers=2, stdout=io.StringIO())
+
+        for user in users:
+            user.refresh_from_db()
+
+        self.assertEqual(users[0].pfp.name, users[1].pfp.name)
+        self.assertTrue(storage.is_sharded(users[0].pfp.name))
+        self.assertTrue(storage.exists(users[0].pfp.name))
+        self.assertFalse(any(storage.exists(name) for name in names))